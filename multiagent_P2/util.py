@@ -30,6 +30,10 @@ import sys
 import inspect
 import heapq
 import random
+import collections
+import os
+import stat
+import tempfile
 import io
 
 
@@ -154,21 +158,24 @@ class Stack:
 
 
 class Queue:
-    "A container with a first-in-first-out (FIFO) queuing policy."
+    """
+    A container with a first-in-first-out (FIFO) queuing policy.  Backed by a
+    collections.deque, so both push and pop take constant time.
+    """
 
     def __init__(self):
-        self.list = []
+        self.list = collections.deque()
 
     def push(self, item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0, item)
+        self.list.append(item)
 
     def pop(self):
         """
         Dequeue the earliest enqueued item still in the queue. This
         operation removes the item from the queue.
         """
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         "Returns true if the queue is empty"
@@ -238,6 +245,109 @@ def manhattanDistance(xy1, xy2):
     return abs(xy1[0] - xy2[0]) + abs(xy1[1] - xy2[1])
 
 
+def mazeDistances(walls, source, costFn=None):
+    """
+    Returns a dict mapping every cell reachable from source in the maze
+    walls (a game.Grid, indexed as walls[x][y]) to its maze distance from
+    source, found in a single sweep of the maze.
+
+    Distances count steps, found by breadth first search, unless costFn is
+    given, in which case entering cell (x,y) costs costFn((x,y)) and the
+    distances are found by Dijkstra's algorithm.  Because maze distance is
+    symmetric for step counts, mazeDistances(walls, food)[position] is the
+    distance from position to food.
+    """
+    distances = {source: 0}
+    if costFn is None:
+        fringe = collections.deque([source])
+        while fringe:
+            x, y = cell = fringe.popleft()
+            nextDistance = distances[cell] + 1
+            for neighbor in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if neighbor not in distances and not walls[neighbor[0]][neighbor[1]]:
+                    distances[neighbor] = nextDistance
+                    fringe.append(neighbor)
+        return distances
+    fringe = [(0, source)]
+    done = set()
+    while fringe:
+        distance, cell = heapq.heappop(fringe)
+        if cell in done:
+            continue
+        done.add(cell)
+        x, y = cell
+        for neighbor in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if neighbor in done or walls[neighbor[0]][neighbor[1]]:
+                continue
+            nextDistance = distance + costFn(neighbor)
+            if neighbor not in distances or nextDistance < distances[neighbor]:
+                distances[neighbor] = nextDistance
+                heapq.heappush(fringe, (nextDistance, neighbor))
+    return distances
+
+
+def getCacheDirectory(name):
+    """
+    Returns the directory of the named on-disk cache, where tables that are
+    slow to build are kept between runs: $XDG_CACHE_HOME/pacman/name, which
+    is ~/.cache/pacman/name by default.  Unlike the shared temporary
+    directory, it belongs to the user.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pacman', name)
+
+
+def isPrivateDirectory(path):
+    """
+    Returns whether path is a directory owned by the user that no one else
+    can write to, so that the cache files in it can be trusted.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(info.st_mode):
+        return False
+    if hasattr(os, 'getuid'):
+        return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    return True
+
+
+def writeCacheFile(path, data):
+    """
+    Writes data (bytes) to the cache file at path, creating its directory,
+    accessible only to the user, if need be.  Nothing is written into a
+    directory that is not private (see isPrivateDirectory).  The data goes to
+    a new temporary file made by tempfile.mkstemp, which is then renamed to
+    path, so a concurrent reader never sees a partly written file.
+
+    Returns whether the file was written; failing to save a cache only costs
+    a rebuild next time.
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    except OSError:
+        return False
+    if not isPrivateDirectory(directory):
+        return False
+    try:
+        handle, temporary = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        return False
+    return True
+
+
 """
 Data structures and functions useful for various course projects
 
@@ -0,0 +1,116 @@
+# distanceTable.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+All-pairs maze distances for a layout.
+
+A DistanceTable holds the maze distance between every pair of open cells of
+a layout in one flat typed array, indexed by cell id.  Tables are built once
+per layout, saved under CACHE_DIR (a cache directory private to the user, see
+util.getCacheDirectory) in a file named after a hash of the layout text, and
+memory-mapped when the same layout is opened again, so only the first run on
+a layout pays for the breadth first searches:
+
+  table = distanceTable.getDistanceTable(gameState.data.layout)
+  table.getDistance((1, 1), (5, 6))
+"""
+
+import array
+import hashlib
+import mmap
+import os
+import sys
+import util
+
+CACHE_DIR = util.getCacheDirectory('distanceTables')
+FORMAT_VERSION = 1
+
+_tables = {}  # (cacheDir, layout text) -> DistanceTable, for tables opened by this process
+
+class DistanceTable:
+    """
+    The maze distances between all pairs of open cells of a layout.
+
+    Cells are numbered in the order of layout.walls.asList(False); the
+    distance from cell i to cell j is entry i * n + j of the table, and
+    UNREACHABLE when there is no path.
+    """
+
+    def __init__(self, layout, cacheDir=CACHE_DIR):
+        self.cells = layout.walls.asList(False)
+        self.cellIds = dict((cell, i) for i, cell in enumerate(self.cells))
+        self.typecode = 'H' if len(self.cells) < 0xFFFF else 'I'
+        self.UNREACHABLE = (1 << (8 * array.array(self.typecode).itemsize)) - 1
+        self.path = None
+        if cacheDir is not None:
+            self.path = os.path.join(cacheDir, self.getCacheName(layout) + '.dist')
+        self.distances = self.load() if self.path is not None else None
+        if self.distances is None:
+            self.distances = self.build(layout.walls)
+            if self.path is not None:
+                self.save()
+
+    def getCacheName(self, layout):
+        "The layout's cache file name: a hash of everything the table depends on."
+        key = '\n'.join([str(FORMAT_VERSION), self.typecode, sys.byteorder] + list(layout.layoutText))
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def build(self, walls):
+        n = len(self.cells)
+        distances = array.array(self.typecode, [self.UNREACHABLE]) * (n * n)
+        for i, cell in enumerate(self.cells):
+            row = i * n
+            for other, distance in util.mazeDistances(walls, cell).items():
+                distances[row + self.cellIds[other]] = distance
+        return distances
+
+    def load(self):
+        "Memory-maps the cached table, or returns None if there is no usable one."
+        if not util.isPrivateDirectory(os.path.dirname(self.path)):
+            return None
+        expected = len(self.cells) ** 2 * array.array(self.typecode).itemsize
+        try:
+            with open(self.path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size != expected:
+                    return None
+                self.mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        return memoryview(self.mapping).cast(self.typecode)
+
+    def save(self):
+        "Writes the table to its cache file (see util.writeCacheFile)."
+        util.writeCacheFile(self.path, self.distances.tobytes())
+
+    def getDistance(self, point1, point2):
+        "Returns the maze distance between two open cells (None if unreachable)."
+        distance = self.distances[self.cellIds[point1] * len(self.cells) + self.cellIds[point2]]
+        return None if distance == self.UNREACHABLE else distance
+
+    def getDistancesFrom(self, point):
+        "Returns a dict mapping every cell reachable from point to its distance."
+        n = len(self.cells)
+        row = self.cellIds[point] * n
+        return dict((self.cells[j], self.distances[row + j]) for j in range(n)
+                    if self.distances[row + j] != self.UNREACHABLE)
+
+def getDistanceTable(layout, cacheDir=CACHE_DIR):
+    """
+    Returns the DistanceTable of layout, reusing the one already opened by
+    this process if there is one, and otherwise loading or building it.
+    """
+    key = (cacheDir, tuple(layout.layoutText))
+    if key not in _tables:
+        _tables[key] = DistanceTable(layout, cacheDir)
+    return _tables[key]
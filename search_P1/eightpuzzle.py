@@ -14,54 +14,85 @@
 
 import search
 import random
+import patternDatabase
 
 # Module Classes
 
-class EightPuzzleState:
+class NPuzzleState:
     """
-    The Eight Puzzle is described in the course textbook on
-    page 64.
+    A sliding-tile puzzle of any width: the eight puzzle (width 3), the
+    fifteen puzzle (width 4), and so on.
 
-    This class defines the mechanics of the puzzle itself.  The
-    task of recasting this puzzle as a search problem is left to
-    the EightPuzzleSearchProblem class.
+    The tiles are packed into a single int, bitsPerTile bits per position in
+    row-major order, so hashing and equality are those of an int and a move
+    only shifts one tile's bits.  The blank's possible moves from each
+    position are looked up in a table built once per width.
     """
 
-    def __init__( self, numbers ):
-        """
-          Constructs a new eight puzzle from an ordering of numbers.
+    _moveTables = {}  # width -> [[(move, new blank position)] for each position]
+    _goals = {}  # width -> packing of the goal
 
-        numbers: a list of integers from 0 to 8 representing an
-          instance of the eight puzzle.  0 represents the blank
-          space.  Thus, the list
-
-            [1, 0, 2, 3, 4, 5, 6, 7, 8]
-
-          represents the eight puzzle:
-            -------------
-            | 1 |   | 2 |
-            -------------
-            | 3 | 4 | 5 |
-            -------------
-            | 6 | 7 | 8 |
-            ------------
+    def __init__( self, numbers, width=None ):
+        """
+          Constructs a new puzzle from an ordering of numbers.
 
-        The configuration of the puzzle is stored in a 2-dimensional
-        list (a list of lists) 'cells'.
+        numbers: a list of the integers from 0 to width * width - 1, in
+          row-major order, 0 being the blank.  width defaults to the square
+          root of len(numbers).
         """
-        self.cells = []
-        numbers = numbers[:] # Make a copy so as not to cause side-effects.
-        numbers.reverse()
-        for row in range( 3 ):
-            self.cells.append( [] )
-            for col in range( 3 ):
-                self.cells[row].append( numbers.pop() )
-                if self.cells[row][col] == 0:
-                    self.blankLocation = row, col
+        if width is None:
+            width = int(round(len(numbers) ** 0.5))
+        if sorted(numbers) != list(range(width * width)):
+            raise ValueError('Not a %dx%d puzzle: %s' % (width, width, numbers))
+        self.width = width
+        self.bitsPerTile = max(4, (width * width - 1).bit_length())
+        self.packed = 0
+        for position, number in enumerate(numbers):
+            self.packed |= number << (position * self.bitsPerTile)
+        self.blankPosition = numbers.index(0)
+
+    def getMoveTable(width):
+        "Returns, for each blank position, the (move, new blank position) pairs."
+        if width not in NPuzzleState._moveTables:
+            table = []
+            for position in range(width * width):
+                row, col = divmod(position, width)
+                moves = []
+                if(row != 0):
+                    moves.append(('up', position - width))
+                if(row != width - 1):
+                    moves.append(('down', position + width))
+                if(col != 0):
+                    moves.append(('left', position - 1))
+                if(col != width - 1):
+                    moves.append(('right', position + 1))
+                table.append(moves)
+            NPuzzleState._moveTables[width] = table
+        return NPuzzleState._moveTables[width]
+    getMoveTable = staticmethod(getMoveTable)
+
+    def getTiles( self ):
+        "Returns the numbers of the puzzle as a flat list, in row-major order."
+        mask = (1 << self.bitsPerTile) - 1
+        return [(self.packed >> (position * self.bitsPerTile)) & mask
+                for position in range(self.width * self.width)]
+
+    def getCells( self ):
+        "Returns the numbers of the puzzle as a list of rows."
+        tiles = self.getTiles()
+        return [tiles[row * self.width:(row + 1) * self.width] for row in range(self.width)]
+
+    cells = property(getCells)
+
+    def getBlankLocation( self ):
+        return divmod(self.blankPosition, self.width)
+
+    blankLocation = property(getBlankLocation)
 
     def isGoal( self ):
         """
-          Checks to see if the puzzle is in its goal state.
+          Checks to see if the puzzle is in its goal state, in which the
+        blank is in the top left corner and the numbers follow in order:
 
             -------------
             |   | 1 | 2 |
@@ -77,13 +108,32 @@ class EightPuzzleState:
         >>> EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).isGoal()
         False
         """
-        current = 0
-        for row in range( 3 ):
-            for col in range( 3 ):
-                if current != self.cells[row][col]:
-                    return False
-                current += 1
-        return True
+        if self.width not in NPuzzleState._goals:
+            NPuzzleState._goals[self.width] = NPuzzleState(list(range(self.width * self.width))).packed
+        return self.packed == NPuzzleState._goals[self.width]
+
+    def isSolvable( self ):
+        """
+          Checks whether the goal can be reached from this puzzle at all,
+        which is true of exactly half of all orderings.  Every move swaps
+        the blank with a tile, which flips the parity of the ordering (as a
+        permutation) and of the blank's distance from its goal position, so
+        the two parities must agree.
+        """
+        tiles = self.getTiles()
+        visited = [False] * len(tiles)
+        swaps = 0
+        for start in range(len(tiles)):
+            length = 0
+            position = start
+            while not visited[position]:
+                visited[position] = True
+                position = tiles[position]
+                length += 1
+            if length > 0:
+                swaps += length - 1
+        row, col = self.blankLocation
+        return swaps % 2 == (row + col) % 2
 
     def legalMoves( self ):
         """
@@ -95,87 +145,62 @@ class EightPuzzleState:
         >>> EightPuzzleState([0, 1, 2, 3, 4, 5, 6, 7, 8]).legalMoves()
         ['down', 'right']
         """
-        moves = []
-        row, col = self.blankLocation
-        if(row != 0):
-            moves.append('up')
-        if(row != 2):
-            moves.append('down')
-        if(col != 0):
-            moves.append('left')
-        if(col != 2):
-            moves.append('right')
-        return moves
+        return [move for move, position in NPuzzleState.getMoveTable(self.width)[self.blankPosition]]
 
     def result(self, move):
         """
-          Returns a new eightPuzzle with the current state and blankLocation
+          Returns a new puzzle with the current state and blank location
         updated based on the provided move.
 
         The move should be a string drawn from a list returned by legalMoves.
-        Illegal moves will raise an exception, which may be an array bounds
-        exception.
+        Illegal moves raise an exception.
 
         NOTE: This function *does not* change the current object.  Instead,
         it returns a new object.
         """
-        row, col = self.blankLocation
-        if(move == 'up'):
-            newrow = row - 1
-            newcol = col
-        elif(move == 'down'):
-            newrow = row + 1
-            newcol = col
-        elif(move == 'left'):
-            newrow = row
-            newcol = col - 1
-        elif(move == 'right'):
-            newrow = row
-            newcol = col + 1
+        for legalMove, newBlank in NPuzzleState.getMoveTable(self.width)[self.blankPosition]:
+            if legalMove == move:
+                break
         else:
-            raise "Illegal Move"
-
-        # Create a copy of the current eightPuzzle
-        newPuzzle = EightPuzzleState([0, 0, 0, 0, 0, 0, 0, 0, 0])
-        newPuzzle.cells = [values[:] for values in self.cells]
-        # And update it to reflect the move
-        newPuzzle.cells[row][col] = self.cells[newrow][newcol]
-        newPuzzle.cells[newrow][newcol] = self.cells[row][col]
-        newPuzzle.blankLocation = newrow, newcol
-
+            raise Exception('Illegal move: ' + str(move))
+        bits = self.bitsPerTile
+        tile = (self.packed >> (newBlank * bits)) & ((1 << bits) - 1)
+        newPuzzle = NPuzzleState.__new__(self.__class__)
+        newPuzzle.width = self.width
+        newPuzzle.bitsPerTile = bits
+        newPuzzle.packed = self.packed - (tile << (newBlank * bits)) + (tile << (self.blankPosition * bits))
+        newPuzzle.blankPosition = newBlank
         return newPuzzle
 
     # Utilities for comparison and display
     def __eq__(self, other):
         """
-            Overloads '==' such that two eightPuzzles with the same configuration
+            Overloads '==' such that two puzzles with the same configuration
           are equal.
 
           >>> EightPuzzleState([0, 1, 2, 3, 4, 5, 6, 7, 8]) == \
               EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).result('left')
           True
         """
-        for row in range( 3 ):
-            if self.cells[row] != other.cells[row]:
-                return False
-        return True
+        return self.packed == other.packed and self.width == other.width
 
     def __hash__(self):
-        return hash(str(self.cells))
+        return hash(self.packed)
 
     def __getAsciiString(self):
         """
           Returns a display string for the maze
         """
         lines = []
-        horizontalLine = ('-' * (13))
+        cellWidth = len(str(self.width * self.width - 1))
+        horizontalLine = ('-' * ((cellWidth + 3) * self.width + 1))
         lines.append(horizontalLine)
         for row in self.cells:
             rowLine = '|'
             for col in row:
                 if col == 0:
                     col = ' '
-                rowLine = rowLine + ' ' + col.__str__() + ' |'
+                rowLine = rowLine + ' ' + col.__str__().rjust(cellWidth) + ' |'
             lines.append(rowLine)
             lines.append(horizontalLine)
         return '\n'.join(lines)
@@ -183,6 +208,40 @@ class EightPuzzleState:
     def __str__(self):
         return self.__getAsciiString()
 
+class EightPuzzleState(NPuzzleState):
+    """
+    The Eight Puzzle is described in the course textbook on
+    page 64.
+
+    This class defines the mechanics of the puzzle itself.  The
+    task of recasting this puzzle as a search problem is left to
+    the EightPuzzleSearchProblem class.
+    """
+
+    def __init__( self, numbers ):
+        """
+          Constructs a new eight puzzle from an ordering of numbers.
+
+        numbers: a list of integers from 0 to 8 representing an
+          instance of the eight puzzle.  0 represents the blank
+          space.  Thus, the list
+
+            [1, 0, 2, 3, 4, 5, 6, 7, 8]
+
+          represents the eight puzzle:
+            -------------
+            | 1 |   | 2 |
+            -------------
+            | 3 | 4 | 5 |
+            -------------
+            | 6 | 7 | 8 |
+            ------------
+
+        The configuration of the puzzle is packed into an int (see
+        NPuzzleState); 'cells' gives it as a list of lists.
+        """
+        NPuzzleState.__init__(self, numbers, 3)
+
 # TODO: Implement The methods in this class
 
 class EightPuzzleSearchProblem(search.SearchProblem):
@@ -196,7 +255,7 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         self.puzzle = puzzle
 
     def getStartState(self):
-        return puzzle
+        return self.puzzle
 
     def isGoalState(self,state):
         return state.isGoal()
@@ -221,6 +280,44 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         """
         return len(actions)
 
+def eightPuzzleHeuristic(state, problem=None):
+    """
+    An additive pattern database heuristic (see patternDatabase.py): tiles
+    1-4 and tiles 5-8 each have a database of the moves needed to bring them
+    home.  It is admissible and consistent, and far better informed than the
+    Manhattan distance.  Use it as search.aStarSearch(problem, eightPuzzleHeuristic).
+    It works for NPuzzleStates of other widths too, such as the fifteen
+    puzzle, with the default patterns of patternDatabase.py.
+    """
+    return patternDatabase.getPatternDatabases(state.width).getCost(state.getTiles())
+
+def eightPuzzleTableSearch(problem):
+    """
+    Solves an EightPuzzleSearchProblem without searching, by walking
+    downhill in the complete table of solution lengths
+    (patternDatabase.EightPuzzleTable): from each puzzle it takes the first
+    move to a puzzle one move closer to the goal.  The plan is optimal and
+    takes one table lookup per successor along it.  The table is built, in
+    about a second, the first time it is needed on a machine, and read from
+    disk afterwards.
+
+    Returns None for a puzzle that cannot be solved.
+    """
+    table = patternDatabase.getEightPuzzleTable()
+    state = problem.getStartState()
+    if not state.isSolvable():
+        return None
+    distance = table.getDistance(state.getTiles())
+    actions = []
+    while distance > 0:
+        for successor, action, stepCost in problem.getSuccessors(state):
+            if table.getDistance(successor.getTiles()) == distance - 1:
+                break
+        actions.append(action)
+        state = successor
+        distance -= 1
+    return actions
+
 EIGHT_PUZZLE_DATA = [[1, 0, 2, 3, 4, 5, 6, 7, 8],
                      [1, 7, 8, 2, 3, 4, 5, 6, 0],
                      [4, 3, 2, 7, 0, 5, 1, 6, 8],
@@ -246,7 +343,10 @@ def loadEightPuzzle(puzzleNumber):
       | 6 | 7 | 8 |
       -------------
     """
-    return EightPuzzleState(EIGHT_PUZZLE_DATA[puzzleNumber])
+    puzzle = EightPuzzleState(EIGHT_PUZZLE_DATA[puzzleNumber])
+    if not puzzle.isSolvable():
+        raise ValueError('Eight puzzle %d cannot be solved' % puzzleNumber)
+    return puzzle
 
 def createRandomEightPuzzle(moves=100):
     """
@@ -256,7 +356,18 @@ def createRandomEightPuzzle(moves=100):
       a series of 'moves' random moves to a solved
       puzzle.
     """
-    puzzle = EightPuzzleState([0,1,2,3,4,5,6,7,8])
+    return createRandomPuzzle(3, moves)
+
+def createRandomPuzzle(width, moves=100):
+    """
+      width: the width of the puzzle (4 for the fifteen puzzle)
+      moves: number of random moves to apply
+
+      Creates a random width x width puzzle the way createRandomEightPuzzle
+      creates an eight puzzle.
+    """
+    numbers = list(range(width * width))
+    puzzle = EightPuzzleState(numbers) if width == 3 else NPuzzleState(numbers, width)
     for i in range(moves):
         # Execute a random legal move
         puzzle = puzzle.result(random.sample(puzzle.legalMoves(), 1)[0])
@@ -0,0 +1,141 @@
+# frontierBenchmark.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Times the frontier data structures in util.py (Stack, Queue, PriorityQueue,
+IndexedPriorityQueue and BucketPriorityQueue) so that a change which makes one of them slower
+shows up before it shows up as a slow search.
+
+Two kinds of workload are run:
+
+  synthetic: n pushes followed by n pops, and n interleaved push/pop pairs
+             on a queue that is kept half full.
+  maze:      a plain graph search over the PositionSearchProblem of a layout,
+             run to exhaustion with each frontier in turn.
+
+> python frontierBenchmark.py
+> python frontierBenchmark.py -n 200000 -l bigMaze,openMaze -r 5
+"""
+
+import random
+import sys
+import time
+import util
+
+FRONTIERS = ['Stack', 'Queue', 'PriorityQueue', 'IndexedPriorityQueue', 'BucketPriorityQueue']
+
+def makeFrontier(name):
+    """
+    Returns (frontier, push) for the named util class, where push(item,
+    priority) hides the different push signatures.
+    """
+    frontier = getattr(util, name)()
+    if name in ('PriorityQueue', 'IndexedPriorityQueue', 'BucketPriorityQueue'):
+        return frontier, frontier.push
+    return frontier, lambda item, priority: frontier.push(item)
+
+def fillThenDrain(name, n, priorities):
+    frontier, push = makeFrontier(name)
+    for i in range(n):
+        push(i, priorities[i])
+    while not frontier.isEmpty():
+        frontier.pop()
+
+def interleaved(name, n, priorities):
+    frontier, push = makeFrontier(name)
+    for i in range(n // 2):
+        push(i, priorities[i])
+    for i in range(n // 2, n):
+        push(i, priorities[i])
+        frontier.pop()
+
+def mazeSearch(name, problem):
+    """
+    Expands every reachable state of problem, using the named frontier.
+    Returns the number of states expanded.
+    """
+    frontier, push = makeFrontier(name)
+    start = problem.getStartState()
+    push((start, 0), 0)
+    reached = set()
+    while not frontier.isEmpty():
+        state, cost = frontier.pop()
+        if state in reached:
+            continue
+        reached.add(state)
+        for successor, action, stepCost in problem.getSuccessors(state):
+            if successor not in reached:
+                push((successor, cost + stepCost), cost + stepCost)
+    return len(reached)
+
+def timeIt(function, repeats):
+    "Returns the best wall time, in seconds, of repeats calls to function."
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def loadPositionProblem(layoutName):
+    import layout, pacman, searchAgents
+    lay = layout.getLayout(layoutName)
+    if lay is None:
+        raise Exception("The layout " + layoutName + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+    return searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+
+def runBenchmarks(n, layouts, repeats, frontiers=FRONTIERS):
+    """
+    Runs every workload against every frontier and returns a list of
+    (workload, frontier, seconds) rows.
+    """
+    rng = random.Random(0)
+    priorities = [rng.randint(0, n) for _ in range(n)]
+    rows = []
+    for name in frontiers:
+        rows.append(('fill-drain %d' % n, name, timeIt(lambda: fillThenDrain(name, n, priorities), repeats)))
+        rows.append(('interleaved %d' % n, name, timeIt(lambda: interleaved(name, n, priorities), repeats)))
+    for layoutName in layouts:
+        problem = loadPositionProblem(layoutName)
+        for name in frontiers:
+            rows.append(('maze ' + layoutName, name, timeIt(lambda: mazeSearch(name, problem), repeats)))
+    return rows
+
+def printRows(rows):
+    print('%-24s %-22s %10s' % ('workload', 'frontier', 'ms'))
+    for workload, name, seconds in rows:
+        print('%-24s %-22s %10.2f' % (workload, name, seconds * 1000))
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(usage=__doc__)
+    parser.add_option('-n', '--size', dest='size', type='int', default=50000,
+                      help='number of items in the synthetic workloads (default %default)')
+    parser.add_option('-l', '--layouts', dest='layouts', default='mediumMaze,bigMaze,openMaze',
+                      help='comma separated layouts for the maze workloads (default %default)')
+    parser.add_option('-r', '--repeats', dest='repeats', type='int', default=3,
+                      help='runs per measurement; the best is reported (default %default)')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    layouts = [name for name in options.layouts.split(',') if name]
+    printRows(runBenchmarks(options.size, layouts, options.repeats))
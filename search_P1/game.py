@@ -280,6 +280,84 @@ def reconstituteGrid(bitRep):
     width, height = bitRep[:2]
     return Grid(width, height, bitRepresentation= bitRep[2:])
 
+class BitmaskGrid:
+    """
+    An immutable Grid of booleans stored as a single int, with bit
+    x * height + y holding grid[x][y].
+
+    Search states that carry a grid (such as the food in FoodSearchProblem)
+    can use one instead of a Grid: copying is free because nothing is ever
+    changed in place (without() returns a new grid), counting is a popcount,
+    and hashing and equality are those of the int.  Reading works as for a
+    Grid, through grid[x][y], asList() and count().
+    """
+    __slots__ = ('width', 'height', 'bits')
+
+    def __init__(self, width, height, bits=0):
+        self.width = width
+        self.height = height
+        self.bits = bits
+
+    def fromGrid(grid):
+        "Returns a BitmaskGrid with the same contents as the Grid grid."
+        bits = 0
+        for x, y in grid.asList():
+            bits |= 1 << (x * grid.height + y)
+        return BitmaskGrid(grid.width, grid.height, bits)
+    fromGrid = staticmethod(fromGrid)
+
+    def __getitem__(self, x):
+        column = self.bits >> (x * self.height)
+        return [bool(column >> y & 1) for y in range(self.height)]
+
+    def __str__(self):
+        return str(self.toGrid())
+
+    def __eq__(self, other):
+        return isinstance(other, BitmaskGrid) and self.bits == other.bits and \
+            self.width == other.width and self.height == other.height
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def copy(self):
+        return self
+
+    def deepCopy(self):
+        return self
+
+    def shallowCopy(self):
+        return self
+
+    def count(self, item=True):
+        trues = bin(self.bits).count('1')
+        return trues if item else self.width * self.height - trues
+
+    def asList(self, key=True):
+        if not key:
+            return self.toGrid().asList(False)
+        list = []
+        bits = self.bits
+        while bits:
+            lowest = bits & -bits
+            x, y = divmod(lowest.bit_length() - 1, self.height)
+            list.append((x, y))
+            bits ^= lowest
+        return list
+
+    def without(self, x, y):
+        "Returns a copy of this grid with grid[x][y] cleared."
+        bit = 1 << (x * self.height + y)
+        if not self.bits & bit:
+            return self
+        return BitmaskGrid(self.width, self.height, self.bits ^ bit)
+
+    def toGrid(self):
+        grid = Grid(self.width, self.height)
+        for x, y in self.asList():
+            grid[x][y] = True
+        return grid
+
 ####################################
 # Parts you shouldn't have to read #
 ####################################
@@ -368,6 +446,34 @@ class Actions:
         return (x + dx, y + dy)
     getSuccessor = staticmethod(getSuccessor)
 
+    _adjacencyTables = {}  # walls, as a tuple of columns -> adjacency table, for tables built by this process
+
+    def getAdjacencyTable(walls):
+        """
+        Returns a dict mapping every cell (x,y) of the walls grid to the list
+        of (neighbor, action) pairs for the open cells next to it, in the order
+        North, South, East, West.  Search problems on a grid look successors up
+        here instead of testing the walls on every expansion.
+
+        Tables are built once per layout and shared by every caller with the
+        same walls, so they must not be modified.
+        """
+        key = tuple(tuple(column) for column in walls.data)
+        if key not in Actions._adjacencyTables:
+            table = {}
+            for x in range(walls.width):
+                for y in range(walls.height):
+                    neighbors = []
+                    for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+                        dx, dy = Actions._directions[action]
+                        nextx, nexty = x + dx, y + dy
+                        if 0 <= nextx < walls.width and 0 <= nexty < walls.height and not walls[nextx][nexty]:
+                            neighbors.append(((nextx, nexty), action))
+                    table[(x, y)] = neighbors
+            Actions._adjacencyTables[key] = table
+        return Actions._adjacencyTables[key]
+    getAdjacencyTable = staticmethod(getAdjacencyTable)
+
 class GameStateData:
     """
 
@@ -584,6 +690,8 @@ class Game:
                 self._agentCrash(i, quiet=True)
                 return
             if ("registerInitialState" in dir(agent)):
+                if ("setMaxStartupTime" in dir(agent)):
+                    agent.setMaxStartupTime(self.rules.getMaxStartupTime(i))
                 self.mute(i)
                 if self.catchExceptions:
                     try:
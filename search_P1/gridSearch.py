@@ -0,0 +1,152 @@
+# gridSearch.py
+# -------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Search routines specialised to Pacman mazes: 4-connected grids whose walls
+are given by a game.Grid, indexed as walls[x][y].  Unlike the generic
+algorithms in search.py, these work on the wall grid directly instead of
+going through a SearchProblem's getSuccessors.
+"""
+
+from game import Directions
+import time
+import util
+
+HORIZONTAL = [(1, 0, Directions.EAST), (-1, 0, Directions.WEST)]
+VERTICAL = [(0, 1, Directions.NORTH), (0, -1, Directions.SOUTH)]
+
+def _jump(walls, x, y, dx, dy, isGoal):
+    """
+    Moves from (x,y) one cell at a time in direction (dx,dy) and returns the
+    first jump point met, or None if a wall is hit first.
+
+    Paths are put in a canonical order which takes vertical moves as early as
+    possible.  A cell is a jump point when it is a goal, or
+
+      moving horizontally: when a vertical neighbour is open but the cell
+        behind that neighbour is a wall, so the neighbour cannot have been
+        entered earlier by moving vertically first;
+      moving vertically: when a horizontal jump from it finds a jump point.
+    """
+    while True:
+        x += dx
+        y += dy
+        if walls[x][y]:
+            return None
+        if isGoal((x, y)):
+            return x, y
+        if dx != 0:
+            if (not walls[x][y + 1] and walls[x - dx][y + 1]) or \
+               (not walls[x][y - 1] and walls[x - dx][y - 1]):
+                return x, y
+        else:
+            for hx, hy, _ in HORIZONTAL:
+                if _jump(walls, x, y, hx, hy, isGoal) is not None:
+                    return x, y
+
+def _prunedDirections(walls, x, y, arrival):
+    """
+    Returns the directions worth searching from a jump point reached moving
+    in direction arrival (None at the start, where every direction is).
+    """
+    if arrival is None:
+        return VERTICAL + HORIZONTAL
+    dx, dy, action = arrival
+    if dx == 0:
+        return [arrival] + HORIZONTAL
+    forced = [(vx, vy, a) for vx, vy, a in VERTICAL
+              if not walls[x][y + vy] and walls[x - dx][y + vy]]
+    return [arrival] + forced
+
+def jumpPointSearch(walls, start, isGoal, heuristic=None, stats=None):
+    """
+    Jump point search (JPS) for 4-connected grids with uniform step costs.
+
+    A* is run over jump points only: from each expanded cell the search
+    jumps in straight lines, skipping every cell that a symmetric path of the
+    same length would reach just as well, so long corridors and open areas
+    are crossed without expanding the cells in them.
+
+      walls:     a game.Grid of walls, bordered by walls
+      start:     the (x,y) start cell
+      isGoal:    a function (x,y) -> bool
+      heuristic: an optional function (x,y) -> admissible estimate of the
+                 number of steps to a goal
+      stats:     an optional search.SearchStats to fill in
+
+    Returns (actions, expanded) where actions is a list of Directions that
+    reaches a goal along a shortest path (None if no goal is reachable) and
+    expanded is the number of jump points expanded.
+    """
+    if heuristic is None:
+        heuristic = lambda cell: 0
+    frontier = util.IndexedPriorityQueue(key=lambda entry: entry[0])
+    frontier.push((start, 0, None), heuristic(start))  # entries are (cell, g, arrival direction)
+    parents = {start: None}  # cell -> (parent cell, action) on the best path found
+    costs = {start: 0}
+    closed = set()
+    expanded = 0
+    while not frontier.isEmpty():
+        cell, g, arrival = frontier.pop()
+        if isGoal(cell):
+            return _unwindJumps(parents, cell), expanded
+        closed.add(cell)
+        expanded += 1
+        x, y = cell
+        if stats is not None:
+            started = time.perf_counter()
+        jumps = [(direction, _jump(walls, x, y, direction[0], direction[1], isGoal))
+                 for direction in _prunedDirections(walls, x, y, arrival)]
+        if stats is not None:
+            stats.successorTime += time.perf_counter() - started
+            stats.nodesExpanded += 1
+        for direction, jumpPoint in jumps:
+            if jumpPoint is None:
+                continue
+            if stats is not None:
+                stats.nodesGenerated += 1
+            newCost = g + abs(jumpPoint[0] - x) + abs(jumpPoint[1] - y)
+            if jumpPoint in closed or (jumpPoint in costs and costs[jumpPoint] <= newCost):
+                if stats is not None:
+                    stats.duplicatesPruned += 1
+                continue
+            costs[jumpPoint] = newCost
+            parents[jumpPoint] = (cell, direction[2])
+            frontier.update((jumpPoint, newCost, direction), newCost + heuristic(jumpPoint))
+        if stats is not None:
+            stats.noteSizes(len(frontier), len(closed))
+    return None, expanded
+
+def _unwindJumps(parents, cell):
+    "Expands the chain of jump points ending at cell into single-step actions."
+    actions = []
+    while parents[cell] is not None:
+        parent, action = parents[cell]
+        steps = abs(cell[0] - parent[0]) + abs(cell[1] - parent[1])
+        actions.extend([action] * steps)
+        cell = parent
+    actions.reverse()
+    return actions
+
+def hasUniformCost(problem):
+    """
+    Returns True if problem is a search over (x,y) positions of problem.walls
+    in which every step costs 1, which is what jumpPointSearch needs.
+    """
+    if 'walls' not in dir(problem) or 'costFn' not in dir(problem):
+        return False
+    start = problem.getStartState()
+    if type(start) != tuple or len(start) != 2 or type(start[0]) != int:
+        return False
+    return all(problem.costFn(cell) == 1 for cell in problem.walls.asList(False))
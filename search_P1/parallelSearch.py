@@ -0,0 +1,409 @@
+# parallelSearch.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Searches that use several processes.  The functions in search.py that run in
+parallel (search.portfolioSearch and search.hdaStarSearch) hand their work to
+the routines here.
+
+Worker processes are started with fork, so they inherit the search problem
+and the functions to run instead of having them pickled; only the results
+(plans, counts and search.SearchStats) travel back between processes.  Where
+fork is not available the work is done in this process instead.
+
+A problem's observer (see searchAgents.SearchObserver) is not called from a
+worker, where it would draw on a copy of the parent's display; its events
+are recorded or dropped there and replayed in this process instead.
+"""
+
+import heapq
+import multiprocessing
+import pickle
+import queue
+import search
+
+POLL_INTERVAL = 0.5  # seconds to wait for a message from the workers before checking that they are alive
+
+def canFork():
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+class _ObserverLog:
+    "Stands in for a problem's observer in a worker, recording the events for the parent to replay."
+
+    def __init__(self):
+        self.events = []
+
+    def stateExpanded(self, state):
+        self.events.append(('stateExpanded', state))
+
+    def goalReached(self, state):
+        self.events.append(('goalReached', state))
+
+def _runConfiguration(index, configuration, problem, results):
+    "Runs one portfolio configuration in a worker and sends back its outcome."
+    name, function, arguments = configuration
+    arguments = dict(arguments)
+    if 'stats' in function.__code__.co_varnames:
+        arguments['stats'] = search.SearchStats()
+    log = None
+    if getattr(problem, 'observer', None) is not None:
+        log = problem.observer = _ObserverLog()
+    try:
+        plan = function(problem, **arguments)
+    except Exception as e:
+        results.put((index, None, None, None, None, '%s: %s' % (type(e).__name__, e)))
+        return
+    events = log.events if log is not None else None
+    results.put((index, plan, getattr(problem, '_expanded', None), arguments.get('stats'), events, None))
+
+def runPortfolio(problem, configurations, stats=None):
+    """
+    Runs every configuration on problem, each in its own process, and returns
+    (name, plan) for the first one to finish.  The other processes are then
+    terminated.
+
+      configurations: a list of (name, searchFunction, keywordArguments)
+      stats:          an optional search.SearchStats, filled in with the
+                      winner's statistics
+
+    The winner's expansions are added to problem._expanded, and its observer
+    events are replayed on problem.observer, if it has one.  Configurations
+    that raise an exception, or whose process dies without reporting, drop
+    out of the race; if all of them do, an exception listing their errors is
+    raised.  Each configuration must be optimal (uniform
+    cost search, or A* with a consistent heuristic) for the plan returned to
+    be optimal whichever finishes first.
+    """
+    if not canFork():
+        return _runInProcess(problem, configurations, stats)
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    workers = [context.Process(target=_runConfiguration, args=(i, configuration, problem, results))
+               for i, configuration in enumerate(configurations)]
+    errors = []
+    try:
+        for worker in workers:
+            worker.daemon = True
+            worker.start()
+        reported = set()  # configurations whose outcome is known
+        dead = []  # configurations whose process was found dead without reporting
+        while len(reported) < len(workers):
+            try:
+                index, plan, expanded, workerStats, events, error = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                for i in dead:  # anything they sent before dying would have arrived by now
+                    if i not in reported:
+                        reported.add(i)
+                        errors.append('%s: worker died (exit code %s)' % (configurations[i][0], workers[i].exitcode))
+                dead = [i for i, worker in enumerate(workers) if i not in reported and not worker.is_alive()]
+                continue
+            reported.add(index)
+            if error is not None:
+                errors.append('%s: %s' % (configurations[index][0], error))
+                continue
+            if expanded is not None:
+                problem._expanded = expanded
+            for event, state in events or []:
+                getattr(problem.observer, event)(state)
+            if stats is not None and workerStats is not None:
+                for field in search.SearchStats.FIELDS:
+                    setattr(stats, field, getattr(workerStats, field))
+            return configurations[index][0], plan
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+        for worker in workers:
+            worker.join()
+    raise Exception('Every portfolio configuration failed: ' + '; '.join(errors))
+
+def _runInProcess(problem, configurations, stats):
+    "runPortfolio without fork: runs the configurations one after another until one succeeds."
+    errors = []
+    for name, function, arguments in configurations:
+        arguments = dict(arguments)
+        if stats is not None and 'stats' in function.__code__.co_varnames:
+            arguments['stats'] = stats
+        try:
+            return name, function(problem, **arguments)
+        except Exception as e:
+            errors.append('%s: %s: %s' % (name, type(e).__name__, e))
+    raise Exception('Every portfolio configuration failed: ' + '; '.join(errors))
+
+def hashDistributedAStar(problem, heuristic, workers=None, batchSize=64, stats=None):
+    """
+    Hash distributed A* (HDA*).  Every state is owned by one of workers
+    processes, chosen by hash(state) % workers.  Each worker runs A* on its
+    own open list and sends the children it generates to their owners through
+    queues, batchSize expansions at a time; children a worker owns itself
+    skip the queues.  Owners drop children they already reached at no greater
+    cost and reopen states reached more cheaply than before, so the order in
+    which nodes arrive does not matter.
+
+    A worker that pops a goal reports it to this (coordinating) process,
+    which broadcasts the best goal cost so far as a bound; workers do not
+    expand nodes whose f is not below the bound.  The search ends when every
+    worker is idle (nothing left to expand below the bound) and no batch of
+    nodes is in transit.  Idle workers report how many batches they have
+    sent and received; once the counts balance, the coordinator probes every
+    worker, and stops only if all of them are still idle with the same
+    balanced counts (two identical waves, Mattern's four-counter method).
+    With an admissible heuristic the last goal reported is then optimal.
+
+    The plan is rebuilt by asking the owner of each state on it for the
+    parent it recorded.  Workers are forked, so problem and heuristic need
+    not be picklable, but states must be, as must the actions.
+
+    Returns the list of actions, or None if no goal is reachable.  The
+    workers' expansions are added to problem._expanded, and their counts and
+    times to stats; stats' peak sizes are the sums of the workers' peaks.
+    If a worker raises an exception (in the heuristic, in getSuccessors, or
+    pickling a state) or dies, the others are terminated and an exception
+    naming the failure is raised, as runPortfolio does.
+
+    Workers do not notify problem.observer; the goal found is reported to it
+    from this process.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    context = multiprocessing.get_context('fork')
+    inboxes = [context.Queue() for _ in range(workers)]
+    results = context.Queue()
+    processes = [context.Process(target=_hdaWorker, args=(i, problem, heuristic, inboxes, results, batchSize))
+                 for i in range(workers)]
+    try:
+        for process in processes:
+            process.daemon = True
+            process.start()
+        start = problem.getStartState()
+        _send(inboxes[hash(start) % workers], ('nodes', [(start, 0, None, None)]))
+        goal = _awaitTermination(inboxes, results, processes)
+        plan = None if goal is None else _tracePlan(goal, inboxes, results, processes)
+        if goal is not None and getattr(problem, 'observer', None) is not None:
+            problem.observer.goalReached(goal)
+        for inbox in inboxes:
+            _send(inbox, ('stop',))
+        finished = set()
+        for _ in range(workers):
+            message = _receive(results, 'done', processes, finished)
+            finished.add(message[1])
+            if '_expanded' in dir(problem):
+                problem._expanded += message[2]
+            if stats is not None:
+                for field in search.SearchStats.FIELDS:
+                    if field != 'wallTime':
+                        setattr(stats, field, getattr(stats, field) + getattr(message[3], field))
+        return plan
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+def _send(channel, message):
+    """
+    Puts message on one of hashDistributedAStar's queues, pickled here rather
+    than in the queue's feeder thread, which would only print an error for
+    something that cannot be pickled and drop the message.
+    """
+    channel.put(pickle.dumps(message, pickle.HIGHEST_PROTOCOL))
+
+def _get(channel, block=True):
+    "Takes a message put by _send off channel."
+    return pickle.loads(channel.get(block=block))
+
+def _next(results, processes, finished=()):
+    """
+    Returns the next message from the workers to the coordinator.  Raises an
+    exception if a worker reports an error, or if a worker that has not sent
+    'done' (its index is not in finished) has died.
+    """
+    dead = []
+    while True:
+        try:
+            message = pickle.loads(results.get(timeout=POLL_INTERVAL))
+        except queue.Empty:
+            if dead:  # anything they sent before dying would have arrived by now
+                raise Exception('Hash distributed A* worker %s died' %
+                                ', '.join('%d (exit code %s)' % (i, processes[i].exitcode) for i in dead))
+            dead = [i for i, process in enumerate(processes) if i not in finished and not process.is_alive()]
+            continue
+        if message[0] == 'error':
+            raise Exception('Hash distributed A* worker %d failed: %s' % (message[1], message[2]))
+        return message
+
+def _receive(results, kind, processes, finished=()):
+    "Returns the next message of the given kind from the workers, dropping any others."
+    while True:
+        message = _next(results, processes, finished)
+        if message[0] == kind:
+            return message
+
+def _awaitTermination(inboxes, results, processes):
+    """
+    Runs the coordinator's side of hashDistributedAStar until the search is
+    over, and returns the best goal found (None if there is none).
+    """
+    workers = len(inboxes)
+    bound, goal = float('inf'), None
+    idle = {}  # worker -> (batches sent, batches received) at its last idle report
+    idleChanged = False  # whether an idle report came in since the last probe
+    wave, replies, snapshot = 0, None, None
+
+    def totals(counts):
+        return sum(c[0] for c in counts.values()), sum(c[1] for c in counts.values())
+
+    def balanced(sent, received):
+        return sent + 1 == received  # the start node is the one batch sent from here
+
+    while True:
+        message = _next(results, processes)
+        kind = message[0]
+        if kind == 'solution':
+            state, cost = message[2], message[3]
+            if cost < bound:
+                bound, goal = cost, state
+                for inbox in inboxes:
+                    _send(inbox, ('bound', bound))
+        elif kind == 'idle':
+            idle[message[1]] = message[2:]
+            idleChanged = True
+        elif kind == 'probe' and message[2] == wave:
+            replies[message[1]] = message[3:]
+            if len(replies) == workers:
+                allIdle = all(reply[0] for reply in replies.values())
+                counts = totals(dict((i, reply[1:]) for i, reply in replies.items()))
+                replies = None
+                # Otherwise whoever is still busy sends an idle report when it is done
+                if allIdle and balanced(*counts):
+                    if counts == snapshot:
+                        return goal
+                    snapshot = counts
+                    replies = _probe(inboxes, wave + 1)
+                    wave += 1
+        if replies is None and idleChanged and len(idle) == workers and balanced(*totals(idle)):
+            snapshot = totals(idle)
+            idleChanged = False
+            replies = _probe(inboxes, wave + 1)
+            wave += 1
+
+def _probe(inboxes, wave):
+    "Asks every worker for its state, and returns the dict to collect the replies in."
+    for inbox in inboxes:
+        _send(inbox, ('probe', wave))
+    return {}
+
+def _tracePlan(goal, inboxes, results, processes):
+    "Follows the parents recorded by the workers back from goal to the start."
+    actions = []
+    state = goal
+    while True:
+        _send(inboxes[hash(state) % len(inboxes)], ('trace', state))
+        parent, action = _receive(results, 'trace', processes)[1:]
+        if parent is None:
+            break
+        actions.append(action)
+        state = parent
+    actions.reverse()
+    return actions
+
+def _hdaWorker(index, problem, heuristic, inboxes, results, batchSize):
+    "One worker of hashDistributedAStar; reports any exception to the coordinator."
+    if getattr(problem, 'observer', None) is not None:
+        problem.observer = None
+    try:
+        _hdaSearch(index, problem, heuristic, inboxes, results, batchSize)
+    except Exception as e:
+        _send(results, ('error', index, '%s: %s' % (type(e).__name__, e)))
+
+def _hdaSearch(index, problem, heuristic, inboxes, results, batchSize):
+    "A* over the states worker index owns, until the coordinator stops it."
+    workers = len(inboxes)
+    inbox = inboxes[index]
+    stats = search.SearchStats()
+    getSuccessors = stats.timeSuccessors(problem.getSuccessors)
+    heuristic = stats.timeHeuristic(heuristic)
+    expandedBefore = getattr(problem, '_expanded', 0)
+    frontier = []  # heap of (f, count, g, state)
+    best = {}  # state -> (g, parent state, action) of the cheapest path reached
+    outboxes = [[] for _ in range(workers)]
+    bound = float('inf')
+    sent = received = count = 0
+    idleReported = False
+
+    def reach(state, g, parent, action):
+        nonlocal count
+        if state in best and best[state][0] <= g:
+            stats.duplicatesPruned += 1
+            return
+        best[state] = (g, parent, action)
+        count += 1
+        heapq.heappush(frontier, (g + heuristic(state, problem), count, g, state))
+
+    while True:
+        # Read every waiting message, waiting for one when there is nothing to expand
+        while True:
+            working = len(frontier) > 0 and frontier[0][0] < bound
+            if not working:
+                for i in range(workers):
+                    if outboxes[i]:
+                        _send(inboxes[i], ('nodes', outboxes[i]))
+                        outboxes[i] = []
+                        sent += 1
+                if not idleReported:
+                    _send(results, ('idle', index, sent, received))
+                    idleReported = True
+            try:
+                message = _get(inbox, block=not working)
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == 'nodes':
+                received += 1
+                idleReported = False
+                for node in message[1]:
+                    reach(*node)
+            elif kind == 'bound':
+                bound = min(bound, message[1])
+            elif kind == 'probe':
+                _send(results, ('probe', index, message[1], not working, sent, received))
+            elif kind == 'trace':
+                _send(results, ('trace',) + best[message[1]][1:])
+            elif kind == 'stop':
+                _send(results, ('done', index, getattr(problem, '_expanded', 0) - expandedBefore, stats))
+                return
+
+        for _ in range(batchSize):
+            if not frontier or frontier[0][0] >= bound:
+                break
+            f, _, g, state = heapq.heappop(frontier)
+            if g > best[state][0]:
+                continue
+            if problem.isGoalState(state):
+                bound = g
+                _send(results, ('solution', index, state, g))
+                continue
+            for child, action, stepCost in getSuccessors(state):
+                owner = hash(child) % workers
+                if owner == index:
+                    reach(child, g + stepCost, state, action)
+                else:
+                    outboxes[owner].append((child, g + stepCost, state, action))
+        for i in range(workers):
+            if outboxes[i]:
+                _send(inboxes[i], ('nodes', outboxes[i]))
+                outboxes[i] = []
+                sent += 1
+        stats.noteSizes(len(frontier), len(best))
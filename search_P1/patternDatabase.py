@@ -0,0 +1,271 @@
+# patternDatabase.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Additive pattern databases for sliding-tile puzzles of any width: the eight
+puzzle (width 3), the fifteen puzzle (width 4), and so on.
+
+Puzzles are given as flat lists of tiles in row-major order, 0 being the
+blank, and are solved when tile t is at position t (the goal of
+eightpuzzle.py).  A pattern is a set of tiles; its database holds, for every
+placement of those tiles and of the blank, the fewest moves of pattern tiles
+needed to bring them home, found by a breadth first search backwards from
+the goal in which moving any other tile is free.  Since each move shifts one
+tile, the costs of disjoint patterns add up to an admissible heuristic.
+
+The blank is kept in the databases, although that makes them larger, because
+taking the minimum over blank positions instead would make the heuristic
+inconsistent: one move could then lower it by more than one.  With the blank
+kept, moving another tile leaves a pattern's cost unchanged (such moves are
+free and reversible) and moving a pattern tile changes it by at most one.
+
+Databases are one byte per entry and are saved under CACHE_DIR, a cache
+directory private to the user (see util.getCacheDirectory), after they are
+first built, so later runs only read them:
+
+  databases = patternDatabase.getPatternDatabases(4)  # the fifteen puzzle
+  databases.getCost(tiles)
+
+Building is a one-time cost: a fraction of a second for the default eight
+puzzle patterns, and about twenty seconds per pattern (16MB each) for the
+fifteen puzzle's.
+
+The eight puzzle is small enough to have a complete database as well, the
+EightPuzzleTable, which holds the exact solution length of every solvable
+eight puzzle.
+"""
+
+import os
+import util
+
+CACHE_DIR = util.getCacheDirectory('patternDatabases')
+FORMAT_VERSION = 1
+UNKNOWN = 255
+
+DEFAULT_PATTERNS = {
+    3: ((1, 2, 3, 4), (5, 6, 7, 8)),
+    4: ((1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12, 13, 14, 15)),
+}
+
+_databases = {}  # (width, patterns, cacheDir) -> PatternDatabases (and the EightPuzzleTable) opened by this process
+
+def loadBytes(path, size):
+    """
+    Returns the contents of the cache file at path, or None if it is missing,
+    is not size bytes long, or is in a directory other users can write to.
+    """
+    if not util.isPrivateDirectory(os.path.dirname(path)):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    return data if len(data) == size else None
+
+def getNeighbors(width):
+    "Returns, for each position of a width x width puzzle, the positions next to it."
+    neighbors = []
+    for position in range(width * width):
+        row, col = divmod(position, width)
+        cells = []
+        if row > 0: cells.append(position - width)
+        if row < width - 1: cells.append(position + width)
+        if col > 0: cells.append(position - 1)
+        if col < width - 1: cells.append(position + 1)
+        neighbors.append(cells)
+    return neighbors
+
+class PatternDatabase:
+    """
+    The pattern database of one pattern.  The entry for the placement in
+    which pattern[i] is at position p[i] and the blank at position b is
+    costs[b + sum(p[i] * size ** (i + 1))], where size = width * width.
+    """
+
+    def __init__(self, width, pattern, cacheDir=CACHE_DIR):
+        self.width = width
+        self.pattern = tuple(pattern)
+        self.size = width * width
+        self.powers = [self.size ** (i + 1) for i in range(len(self.pattern))]
+        self.path = None
+        if cacheDir is not None:
+            name = 'pdb-v%d-%dx%d-%s.bytes' % (FORMAT_VERSION, width, width, '-'.join(map(str, self.pattern)))
+            self.path = os.path.join(cacheDir, name)
+        self.costs = self.load() if self.path is not None else None
+        if self.costs is None:
+            self.costs = self.build()
+            if self.path is not None:
+                self.save()
+
+    def build(self):
+        """
+        Breadth first search backwards from the goal over (pattern placement,
+        blank position) pairs.  Layer d holds the pairs d pattern moves from
+        the goal; within a layer, moves of other tiles (free) are followed
+        depth first before the next layer is started.
+        """
+        size, powers = self.size, self.powers
+        neighbors = getNeighbors(self.width)
+        costs = bytearray([UNKNOWN]) * (size ** (len(self.pattern) + 1))
+        layer = [(self.pattern, 0)]  # in the goal, tile t is at position t and the blank at 0
+        cost = 0
+        while layer:
+            nextLayer = []
+            stack = layer
+            while stack:
+                positions, blank = stack.pop()
+                index = blank
+                for position, power in zip(positions, powers):
+                    index += position * power
+                if costs[index] != UNKNOWN:
+                    continue
+                costs[index] = cost
+                for cell in neighbors[blank]:
+                    if cell in positions:
+                        i = positions.index(cell)
+                        nextLayer.append((positions[:i] + (blank,) + positions[i + 1:], cell))
+                    else:
+                        stack.append((positions, cell))
+            layer = nextLayer
+            cost += 1
+        return costs
+
+    def load(self):
+        "Reads the cached database, or returns None if there is no usable one."
+        return loadBytes(self.path, self.size ** (len(self.pattern) + 1))
+
+    def save(self):
+        util.writeCacheFile(self.path, self.costs)
+
+    def getCost(self, where):
+        "Returns the cost of the placement where[tile] = position of tile (0 for the blank)."
+        index = where[0]
+        for tile, power in zip(self.pattern, self.powers):
+            index += where[tile] * power
+        return self.costs[index]
+
+class PatternDatabases:
+    "Disjoint pattern databases whose costs are added together."
+
+    def __init__(self, width, patterns=None, cacheDir=CACHE_DIR):
+        if patterns is None:
+            patterns = DEFAULT_PATTERNS[width]
+        tiles = [tile for pattern in patterns for tile in pattern]
+        if len(tiles) != len(set(tiles)) or 0 in tiles:
+            raise ValueError('Patterns must be disjoint and must not include the blank')
+        self.width = width
+        self.databases = [PatternDatabase(width, pattern, cacheDir) for pattern in patterns]
+
+    def getCost(self, tiles):
+        """
+        Returns the heuristic value of a puzzle, given as a flat list of its
+        tiles in row-major order.
+        """
+        where = [0] * len(tiles)
+        for position, tile in enumerate(tiles):
+            where[tile] = position
+        return sum(database.getCost(where) for database in self.databases)
+
+def getPatternDatabases(width, patterns=None, cacheDir=CACHE_DIR):
+    """
+    Returns the PatternDatabases for puzzles of the given width, reusing
+    the ones already opened by this process if there are any.
+    """
+    if patterns is not None:
+        patterns = tuple(tuple(pattern) for pattern in patterns)
+    key = (width, patterns, cacheDir)
+    if key not in _databases:
+        _databases[key] = PatternDatabases(width, patterns, cacheDir)
+    return _databases[key]
+
+class EightPuzzleTable:
+    """
+    The exact number of moves to the goal from every eight puzzle that can
+    reach it, one byte per puzzle, found by one breadth first search back
+    from the goal and saved under CACHE_DIR.
+
+    Puzzles are indexed by a minimal perfect hash.  In a puzzle of odd width,
+    no move changes the parity of the order of the tiles read row by row
+    (skipping the blank): sideways moves keep the order and vertical moves
+    jump a tile over two others.  So the solvable eight puzzles are the nine
+    blank positions times the 8!/2 = 20,160 even orderings of the tiles,
+    181,440 in all, and an even ordering is numbered by the first six digits
+    of its Lehmer code, the seventh being fixed by the parity.
+    """
+    ORDERINGS = 20160
+    SIZE = 9 * ORDERINGS
+    WEIGHTS = [2520, 360, 60, 12, 3, 1]  # (7 - i)! / 2: the orderings per value of digit i
+
+    def __init__(self, cacheDir=CACHE_DIR):
+        self.path = None
+        if cacheDir is not None:
+            self.path = os.path.join(cacheDir, 'complete-v%d-3x3.bytes' % FORMAT_VERSION)
+        self.distances = loadBytes(self.path, self.SIZE) if self.path is not None else None
+        if self.distances is None:
+            self.distances = self.build()
+            if self.path is not None:
+                util.writeCacheFile(self.path, self.distances)
+
+    def getIndex(tiles):
+        """
+        Returns the index of a solvable eight puzzle, given as a flat list of
+        its tiles in row-major order.  Unsolvable puzzles share indices with
+        solvable ones, so check them first (eightpuzzle.NPuzzleState.isSolvable).
+        """
+        blank = tiles.index(0)
+        order = [tile for tile in tiles if tile != 0]
+        index = 0
+        for i, weight in enumerate(EightPuzzleTable.WEIGHTS):
+            tile = order[i]
+            smaller = 0
+            for later in order[i + 1:]:
+                if later < tile:
+                    smaller += 1
+            index += smaller * weight
+        return blank * EightPuzzleTable.ORDERINGS + index
+    getIndex = staticmethod(getIndex)
+
+    def build(self):
+        distances = bytearray([UNKNOWN]) * self.SIZE
+        neighbors = getNeighbors(3)
+        goal = tuple(range(9))
+        distances[self.getIndex(goal)] = 0
+        layer = [goal]
+        distance = 0
+        while layer:
+            distance += 1
+            nextLayer = []
+            for tiles in layer:
+                blank = tiles.index(0)
+                for cell in neighbors[blank]:
+                    moved = list(tiles)
+                    moved[blank], moved[cell] = moved[cell], 0
+                    index = self.getIndex(moved)
+                    if distances[index] == UNKNOWN:
+                        distances[index] = distance
+                        nextLayer.append(tuple(moved))
+            layer = nextLayer
+        return distances
+
+    def getDistance(self, tiles):
+        "Returns the number of moves needed to solve a solvable eight puzzle."
+        return self.distances[self.getIndex(tiles)]
+
+def getEightPuzzleTable(cacheDir=CACHE_DIR):
+    "Returns the EightPuzzleTable, reusing the one already opened by this process."
+    key = ('complete', cacheDir)
+    if key not in _databases:
+        _databases[key] = EightPuzzleTable(cacheDir)
+    return _databases[key]
@@ -17,6 +17,7 @@ In search.py, you will implement generic search algorithms which are called by
 Pacman agents (in searchAgents.py).
 """
 
+import time
 import util
 
 class SearchProblem:
@@ -72,7 +73,166 @@ def tinyMazeSearch(problem):
     w = Directions.WEST
     return  [s, s, w, s, w, w, s, w]
 
-def depthFirstSearch(problem: SearchProblem):
+class SearchNode:
+    """
+    A node in the search tree.  Rather than carrying the whole list of
+    directions that leads to its state, a node only remembers the node it was
+    generated from and the action taken there; the plan is rebuilt once, by
+    following the parent links, when a goal node is found.
+
+    The cost of the path to the node (g) is carried forward from the parent
+    with the stepCost returned by getSuccessors, so it never has to be
+    recomputed from the start state.
+    """
+    __slots__ = ('state', 'parent', 'action', 'pathCost')
+
+    def __init__(self, state, parent=None, action=None, stepCost=0):
+        self.state = state
+        self.parent = parent  # node this one was generated from (None for the root)
+        self.action = action  # action taken in parent.state to reach state
+        self.pathCost = stepCost if parent is None else parent.pathCost + stepCost
+
+    def getPath(self):
+        """
+        Returns the list of actions leading from the root node to this node.
+        """
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return actions
+
+
+class SearchStats:
+    """
+    Instrumentation for the search functions below.  Pass an instance as the
+    stats argument of any of them and it is filled in as the search runs;
+    without one, a search pays nothing for it.
+
+      nodesGenerated:   successors returned by getSuccessors
+      nodesExpanded:    calls to getSuccessors
+      duplicatesPruned: nodes dropped because their state was already
+                        expanded, or already reached at least as cheaply
+      peakFrontierSize: largest number of nodes waiting on the frontier
+      peakClosedSize:   largest number of states remembered as expanded
+      heuristicTime:    seconds spent in the heuristic
+      successorTime:    seconds spent in getSuccessors
+      wallTime:         seconds spent in the search function
+
+    Statistics accumulate if the same instance is passed to several searches.
+    """
+    FIELDS = ['nodesGenerated', 'nodesExpanded', 'duplicatesPruned', 'peakFrontierSize',
+              'peakClosedSize', 'heuristicTime', 'successorTime', 'wallTime']
+
+    def __init__(self):
+        for field in self.FIELDS:
+            setattr(self, field, 0)
+        self._started = None
+
+    def start(self):
+        "Starts the wall clock; called as a search begins."
+        self._started = time.perf_counter()
+
+    def stop(self):
+        "Stops the wall clock; called as a search returns."
+        self.wallTime += time.perf_counter() - self._started
+
+    def timeSuccessors(self, getSuccessors):
+        "Wraps a getSuccessors function so that its calls are counted and timed."
+        def timedGetSuccessors(state):
+            started = time.perf_counter()
+            successors = getSuccessors(state)
+            self.successorTime += time.perf_counter() - started
+            self.nodesExpanded += 1
+            self.nodesGenerated += len(successors)
+            return successors
+        return timedGetSuccessors
+
+    def timeHeuristic(self, heuristic):
+        "Wraps a heuristic function so that its calls are timed."
+        def timedHeuristic(state, problem=None):
+            started = time.perf_counter()
+            value = heuristic(state, problem)
+            self.heuristicTime += time.perf_counter() - started
+            return value
+        return timedHeuristic
+
+    def noteSizes(self, frontierSize, closedSize):
+        "Records the current frontier and closed-set sizes."
+        if frontierSize > self.peakFrontierSize:
+            self.peakFrontierSize = frontierSize
+        if closedSize > self.peakClosedSize:
+            self.peakClosedSize = closedSize
+
+    def asDict(self):
+        return dict((field, getattr(self, field)) for field in self.FIELDS)
+
+    def __str__(self):
+        return ('generated %d, expanded %d, duplicates pruned %d, peak frontier %d, peak closed %d, '
+                'heuristic %.3fs, successors %.3fs, wall %.3fs') % tuple(getattr(self, f) for f in self.FIELDS)
+
+def _finish(stats, plan):
+    "Stops the statistics clock, if any, and returns plan."
+    if stats is not None:
+        stats.stop()
+    return plan
+
+class SearchStep:
+    """
+    What the generator form of a search (depthFirstSearchSteps and so on)
+    yields after each expansion:
+
+      node:         the SearchNode just expanded
+      frontierSize: the number of nodes waiting on the frontier
+      g:            the cost of the path to node
+      f:            the priority node was expanded with (g + h for A*-like
+                    searches, g for the others)
+      bestCost:     the cost of the best plan found so far (inf before one is
+                    found; only searches that find plans before they finish,
+                    such as bidirectionalSearch and anytimeAStarSearch, set it)
+      bestNode:     the goal node of that plan, or None; bestNode.getPath()
+                    is the plan
+    """
+    __slots__ = ('node', 'frontierSize', 'f', 'bestCost', 'bestNode')
+
+    def __init__(self, node, frontierSize, f=None, bestCost=float('inf'), bestNode=None):
+        self.node = node
+        self.frontierSize = frontierSize
+        self.f = node.pathCost if f is None else f
+        self.bestCost = bestCost
+        self.bestNode = bestNode
+
+    @property
+    def g(self):
+        return self.node.pathCost
+
+def runSearch(steps):
+    """
+    Runs the generator form of a search to completion and returns its plan.
+
+    The generators make a search resumable: a caller that wants to spread a
+    search over several game turns, stop it early, or draw each expansion as
+    it happens can instead advance the generator itself, e.g.
+
+      steps = search.breadthFirstSearchSteps(problem)
+      for step in itertools.islice(steps, 100):  # expand at most 100 nodes
+          display.drawExpandedCells([step.node.state])
+
+    and later resume or close() it.  When the search finishes, the plan (or
+    None if there is none) is the value of the StopIteration it raises.
+    close() returns nothing, so a caller that stops a search early should
+    keep the last step it was given: the plan found so far, if any, is
+    step.bestNode.getPath().  The statistics clock stops either way.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as finished:
+            return finished.value
+
+def depthFirstSearch(problem: SearchProblem, pruneDuplicates=True, stats=None):
     """
     Search the deepest nodes in the search tree first.
 
@@ -85,76 +245,117 @@ def depthFirstSearch(problem: SearchProblem):
     print("Start:", problem.getStartState())
     print("Is the start a goal?", problem.isGoalState(problem.getStartState()))
     print("Start's successors:", problem.getSuccessors(problem.getStartState()))
+
+    With pruneDuplicates, successors whose state has already been expanded
+    are dropped as they are generated instead of being pushed and skipped
+    when popped.  Successors already on the stack are still pushed, since the
+    newest entry is the one expanded; the order of expansion is the same
+    either way.
     """
-    start_state = problem.getStartState()  # current state of problem
-    start_node = (start_state, None, [])  # node = (curr_state,prev_node,list_of_directions)
-    frontier_dfs = util.Stack()  # create Stack for DFS (LIFO)
-    reached = set()  # create empty set to keep track of reached states
-    frontier_dfs.push(start_node)
-    while not frontier_dfs.isEmpty():
-        curr_node = frontier_dfs.pop()
-        curr_state = curr_node[0]  # state of curr_node
-        # prev_node = curr_node[1]  # previous node of curr_node
-        if problem.isGoalState(curr_state):
-            return curr_node[2]
-        if curr_state not in reached:
-            reached.add(curr_state)
-            for child_state in problem.getSuccessors(curr_state):  # child state = [prev_state/successor,action,
-                # stepCost]
-                child_node = (child_state[0], curr_node, curr_node[2] + [child_state[1]])
-                frontier_dfs.push(child_node)
-
-    return None
-
-
-def breadthFirstSearch(problem: SearchProblem):
-    """Search the shallowest nodes in the search tree first."""
-    start_state = problem.getStartState()  # current state of problem
-    start_node = (start_state, None, [])  # node = (curr_state,prev_node,list_of_directions)
-    frontier_bfs = util.Queue()  # create Queue for BFS
-    reached = set()  # create empty set to keep track of reached states
-    frontier_bfs.push(start_node)
-    while not frontier_bfs.isEmpty():
-        curr_node = frontier_bfs.pop()
-        curr_state = curr_node[0]  # state of curr_node
-        if problem.isGoalState(curr_state):
-            return curr_node[2]
-        if curr_state not in reached:
-            reached.add(curr_state)
-            for child_state in problem.getSuccessors(curr_state):  # child state = [prev_state/successor,action,
-                # stepCost]
-                child_node = (child_state[0], curr_node, curr_node[2] + [child_state[1]])
-                frontier_bfs.push(child_node)
+    return runSearch(depthFirstSearchSteps(problem, pruneDuplicates, stats))
+
+def depthFirstSearchSteps(problem: SearchProblem, pruneDuplicates=True, stats=None):
+    """
+    Generator form of depthFirstSearch: yields a SearchStep after every
+    expansion and returns the plan (see runSearch).
+    """
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+    try:
+        start_node = SearchNode(problem.getStartState())
+        frontier_dfs = util.Stack()  # create Stack for DFS (LIFO)
+        reached = set()  # create empty set to keep track of reached states
+        frontier_dfs.push(start_node)
+        while not frontier_dfs.isEmpty():
+            curr_node = frontier_dfs.pop()
+            curr_state = curr_node.state
+            if problem.isGoalState(curr_state):
+                return curr_node.getPath()
+            if curr_state not in reached:
+                reached.add(curr_state)
+                for child_state, action, step_cost in getSuccessors(curr_state):
+                    if pruneDuplicates and child_state in reached:
+                        if stats is not None:
+                            stats.duplicatesPruned += 1
+                        continue
+                    frontier_dfs.push(SearchNode(child_state, curr_node, action, step_cost))
+                if stats is not None:
+                    stats.noteSizes(len(frontier_dfs), len(reached))
+                yield SearchStep(curr_node, len(frontier_dfs))
+            elif stats is not None:
+                stats.duplicatesPruned += 1
 
-    return None
+        return None
+    finally:
+        if stats is not None:
+            stats.stop()
 
-def uniformCostSearch(problem: SearchProblem):
-    """Search the node of least total cost first."""
 
-    def priorityFunction(node):
-        actual_cost = problem.getCostOfActions(node[2])
-        return actual_cost
-
-    start_state = problem.getStartState()  # current state of problem
-    start_node = (start_state, None, [])  # node = (curr_state,prev_node,list_of_directions)
-    frontier_ucs = util.PriorityQueueWithFunction(priorityFunction)  # create PriorityQ
-    # for UCS (with a priority function)
-    reached = set()  # create empty set
-    frontier_ucs.push(start_node)
-    while not frontier_ucs.isEmpty():
-        curr_node = frontier_ucs.pop()
-        curr_state = curr_node[0]  # state of curr_node
-        # prev_node = curr_node[1]  # previous node of curr_node
-        if problem.isGoalState(curr_state):
-            return curr_node[2]
-        if curr_state not in reached:
-            reached.add(curr_state)
-            for child_state in problem.getSuccessors(curr_state):  # child state = [prev_state/successor,action,
-                # stepCost]
-                child_node = (child_state[0], curr_node, curr_node[2] + [child_state[1]])
-                frontier_ucs.push(child_node)
+def breadthFirstSearch(problem: SearchProblem, pruneDuplicates=True, stats=None):
+    """
+    Search the shallowest nodes in the search tree first.
 
-    return None
+    With pruneDuplicates, successors whose state has already been expanded
+    or is already waiting on the queue are dropped as they are generated:
+    the entry queued first is the one that would be expanded, so the order
+    of expansion is the same as without pruning, but the queue holds each
+    state at most once.
+    """
+    return runSearch(breadthFirstSearchSteps(problem, pruneDuplicates, stats))
+
+def breadthFirstSearchSteps(problem: SearchProblem, pruneDuplicates=True, stats=None):
+    """
+    Generator form of breadthFirstSearch: yields a SearchStep after every
+    expansion and returns the plan (see runSearch).
+    """
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+    try:
+        start_node = SearchNode(problem.getStartState())
+        frontier_bfs = util.Queue()  # create Queue for BFS
+        reached = set()  # create empty set to keep track of reached states
+        seen = {start_node.state}  # states expanded or waiting on the queue, for pruneDuplicates
+        frontier_bfs.push(start_node)
+        while not frontier_bfs.isEmpty():
+            curr_node = frontier_bfs.pop()
+            curr_state = curr_node.state
+            if problem.isGoalState(curr_state):
+                return curr_node.getPath()
+            if curr_state not in reached:
+                reached.add(curr_state)
+                for child_state, action, step_cost in getSuccessors(curr_state):
+                    if pruneDuplicates:
+                        if child_state in seen:
+                            if stats is not None:
+                                stats.duplicatesPruned += 1
+                            continue
+                        seen.add(child_state)
+                    frontier_bfs.push(SearchNode(child_state, curr_node, action, step_cost))
+                if stats is not None:
+                    stats.noteSizes(len(frontier_bfs), len(reached))
+                yield SearchStep(curr_node, len(frontier_bfs))
+            elif stats is not None:
+                stats.duplicatesPruned += 1
+
+        return None
+    finally:
+        if stats is not None:
+            stats.stop()
+
+def uniformCostSearch(problem: SearchProblem, stats=None):
+    """Search the node of least total cost first."""
+    return runSearch(uniformCostSearchSteps(problem, stats))
+
+def uniformCostSearchSteps(problem: SearchProblem, stats=None):
+    """
+    Generator form of uniformCostSearch: yields a SearchStep after every
+    expansion and returns the plan (see runSearch).
+    """
+    return aStarSearchSteps(problem, nullHeuristic, stats)
 
 
 def nullHeuristic(state, problem=None):
@@ -164,33 +365,415 @@ def nullHeuristic(state, problem=None):
     """
     return 0
 
-def aStarSearch(problem: SearchProblem, heuristic=nullHeuristic):
+def aStarSearch(problem: SearchProblem, heuristic=nullHeuristic, stats=None):
     """Search the node that has the lowest combined cost and heuristic first."""
-    def priorityFunction(node):
-        actual_cost = problem.getCostOfActions(node[2])
-        return actual_cost + heuristic(node[0], problem)  # heuristic(state,problem)
-
-    start_state = problem.getStartState()
-    start_node = (start_state, None, [])  # node = (curr_state,prev_node,list_of_directions)
-    frontier_astar = util.PriorityQueueWithFunction(priorityFunction)  # create PriorityQ
-    # for A* with Priority Function (action cost + Heuristic)
-    reached = set()  # create empty set to keep track of reached states
-    frontier_astar.push(start_node)
-    while not frontier_astar.isEmpty():
-        curr_node = frontier_astar.pop()
-        curr_state = curr_node[0]  # state of curr_node
-        if problem.isGoalState(curr_state):
-            return curr_node[2]
-        if curr_state not in reached:
+    return runSearch(aStarSearchSteps(problem, heuristic, stats))
+
+def aStarSearchSteps(problem: SearchProblem, heuristic=nullHeuristic, stats=None):
+    """
+    Generator form of aStarSearch: yields a SearchStep after every expansion
+    and returns the plan (see runSearch).
+    """
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+        heuristic = stats.timeHeuristic(heuristic)
+    try:
+        start_node = SearchNode(problem.getStartState())
+        frontier_astar = util.BucketPriorityQueue(key=lambda node: node.state)  # create PriorityQ
+        # for A* (action cost + Heuristic), keyed by state so that each state has at most one frontier entry;
+        # a bucket queue while priorities are integers, falling back to a heap at the first one that is not
+        reached = set()  # create empty set to keep track of reached states
+        frontier_astar.push(start_node, start_node.pathCost + heuristic(start_node.state, problem))
+        while not frontier_astar.isEmpty():
+            curr_f = frontier_astar.peekPriority()
+            curr_node = frontier_astar.pop()
+            curr_state = curr_node.state
+            if problem.isGoalState(curr_state):
+                return curr_node.getPath()
             reached.add(curr_state)
-            for child_state in problem.getSuccessors(curr_state):  # child state = [prev_state/successor,action,
-                # stepCost]
-                child_node = (child_state[0], curr_node, curr_node[2] + [child_state[1]])
-                frontier_astar.push(child_node)
-    return None
+            for child_state, action, step_cost in getSuccessors(curr_state):
+                if child_state not in reached:
+                    child_node = SearchNode(child_state, curr_node, action, step_cost)
+                    priority = child_node.pathCost + heuristic(child_state, problem)  # heuristic(state,problem)
+                    if not frontier_astar.update(child_node, priority) and stats is not None:  # keeps the entry
+                        stats.duplicatesPruned += 1  # with the lower priority
+                elif stats is not None:
+                    stats.duplicatesPruned += 1
+            if stats is not None:
+                stats.noteSizes(len(frontier_astar), len(reached))
+            yield SearchStep(curr_node, len(frontier_astar), curr_f)
+        return None
+    finally:
+        if stats is not None:
+            stats.stop()
+
+def idaStarSearch(problem: SearchProblem, heuristic=nullHeuristic, tableSize=100000, stats=None):
+    """
+    Iterative-deepening A* (IDA*).  Runs a series of depth-first searches,
+    each cut off at nodes whose f = g + h exceeds the current bound; the next
+    bound is the smallest f that was cut off.  Only the current path (and the
+    successors still to be tried along it) is kept in memory, so problems
+    whose closed set would not fit are still solvable.  With an admissible
+    heuristic the plan returned is optimal.
+
+    tableSize bounds an optional transposition table which remembers the
+    cheapest g each state was explored with during the current iteration, so
+    a state reached again by a path that is no cheaper is not expanded again.
+    Once the table is full no new states are added; tableSize=0 disables it.
+
+    In stats, the frontier is the current path and the closed set is the
+    transposition table.
+    """
+    return runSearch(idaStarSearchSteps(problem, heuristic, tableSize, stats))
+
+def idaStarSearchSteps(problem: SearchProblem, heuristic=nullHeuristic, tableSize=100000, stats=None):
+    """
+    Generator form of idaStarSearch: yields a SearchStep after every
+    expansion and returns the plan (see runSearch).  The frontier size is the
+    length of the current path.
+    """
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+        heuristic = stats.timeHeuristic(heuristic)
+    try:
+        start_node = SearchNode(problem.getStartState())
+        if problem.isGoalState(start_node.state):
+            return start_node.getPath()
+        bound = heuristic(start_node.state, problem)
+        while True:
+            next_bound = float('inf')  # smallest f that exceeded the bound
+            table = {start_node.state: 0}  # transposition table: state -> smallest g this iteration
+            on_path = {start_node.state}  # states on the current path, to avoid cycles
+            stack = [(start_node, iter(getSuccessors(start_node.state)))]
+            while stack:
+                curr_node, successors = stack[-1]
+                for child_state, action, step_cost in successors:
+                    if child_state in on_path:
+                        continue
+                    g = curr_node.pathCost + step_cost
+                    f = g + heuristic(child_state, problem)
+                    if f > bound:
+                        next_bound = min(next_bound, f)
+                        continue
+                    if child_state in table:
+                        if table[child_state] <= g:
+                            if stats is not None:
+                                stats.duplicatesPruned += 1
+                            continue  # already explored at least as cheaply under this bound
+                        table[child_state] = g
+                    elif len(table) < tableSize:
+                        table[child_state] = g
+                    child_node = SearchNode(child_state, curr_node, action, step_cost)
+                    if problem.isGoalState(child_state):
+                        return child_node.getPath()
+                    on_path.add(child_state)
+                    stack.append((child_node, iter(getSuccessors(child_state))))
+                    if stats is not None:
+                        stats.noteSizes(len(stack), len(table))
+                    yield SearchStep(child_node, len(stack), f)
+                    break
+                else:  # every successor has been tried: backtrack
+                    stack.pop()
+                    on_path.discard(curr_node.state)
+            if next_bound == float('inf'):
+                return None  # nothing was cut off, so no goal is reachable
+            bound = next_bound
+    finally:
+        if stats is not None:
+            stats.stop()
+
+def bidirectionalSearch(problem: SearchProblem, stats=None):
+    """
+    Bidirectional uniform cost search: one search grows forward from the
+    start state and another grows backward from the goal, and the plan is
+    joined where they meet.  When start and goal are close, the two searches
+    together expand far fewer states than a single search that has to reach
+    all the way out to the goal; with unit step costs this is bidirectional
+    breadth first search.  The plan returned is optimal.
+
+    Only problems with a single, explicit goal can be searched backwards.
+    Besides the SearchProblem methods, the problem must provide
+
+      getGoalState():          the goal state
+      getPredecessors(state):  a list of triples (predecessor, action,
+                               stepCost) such that taking 'action' in
+                               'predecessor' leads to 'state' at 'stepCost'
+    """
+    return runSearch(bidirectionalSearchSteps(problem, stats))
+
+def bidirectionalSearchSteps(problem: SearchProblem, stats=None):
+    """
+    Generator form of bidirectionalSearch: yields a SearchStep after every
+    expansion, in either direction, and returns the plan (see runSearch).
+    The frontier size counts both frontiers, and bestNode joins the two
+    halves of the cheapest plan found where the searches have met.
+    """
+    getSuccessors, getPredecessors = problem.getSuccessors, problem.getPredecessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+        getPredecessors = stats.timeSuccessors(getPredecessors)
+    try:
+        start_state, goal_state = problem.getStartState(), problem.getGoalState()
+        if start_state == goal_state:
+            return []
+        # Forward nodes link back to the start; backward nodes link forward to the goal,
+        # with 'action' being the action that leads from node.state to node.parent.state.
+        sides = []
+        for root_state, expand in ((start_state, getSuccessors), (goal_state, getPredecessors)):
+            root = SearchNode(root_state)
+            frontier = util.IndexedPriorityQueue(key=lambda node: node.state)
+            frontier.push(root, 0)
+            sides.append((frontier, {root_state: root}, set(), expand))  # (frontier, best node per state, closed, expand)
+
+        best_cost, goal_node = float('inf'), None  # cheapest start-goal path seen, joined into one node
+        forward, backward = sides
+        while not forward[0].isEmpty() and not backward[0].isEmpty():
+            if forward[0].peekPriority() + backward[0].peekPriority() >= best_cost:
+                break  # no path through the unexpanded states can beat best_cost
+            # Grow the side with the smaller frontier
+            side, other = (forward, backward) if len(forward[0]) <= len(backward[0]) else (backward, forward)
+            frontier, best, closed, expand = side
+            curr_node = frontier.pop()
+            closed.add(curr_node.state)
+            for child_state, action, step_cost in expand(curr_node.state):
+                if child_state in closed:
+                    if stats is not None:
+                        stats.duplicatesPruned += 1
+                    continue
+                child_node = SearchNode(child_state, curr_node, action, step_cost)
+                if child_state in best and best[child_state].pathCost <= child_node.pathCost:
+                    if stats is not None:
+                        stats.duplicatesPruned += 1
+                    continue
+                best[child_state] = child_node
+                frontier.update(child_node, child_node.pathCost)
+                if child_state in other[1]:  # reached from the other side too
+                    other_node = other[1][child_state]
+                    if child_node.pathCost + other_node.pathCost < best_cost:
+                        best_cost = child_node.pathCost + other_node.pathCost
+                        goal_node = _joinNodes(child_node, other_node) if side is forward \
+                            else _joinNodes(other_node, child_node)
+            if stats is not None:
+                stats.noteSizes(len(forward[0]) + len(backward[0]), len(forward[2]) + len(backward[2]))
+            yield SearchStep(curr_node, len(forward[0]) + len(backward[0]), bestCost=best_cost, bestNode=goal_node)
+
+        return goal_node.getPath() if goal_node is not None else None
+    finally:
+        if stats is not None:
+            stats.stop()
+
+def _joinNodes(forward_node, backward_node):
+    """
+    Returns a goal node for the path that follows forward_node's path from the
+    start and then backward_node's path, which links forward, to the goal.
+    """
+    node = forward_node
+    while backward_node.parent is not None:
+        node = SearchNode(backward_node.parent.state, node, backward_node.action,
+                          backward_node.pathCost - backward_node.parent.pathCost)
+        backward_node = backward_node.parent
+    return node
+
+def jumpPointSearch(problem: SearchProblem, heuristic=nullHeuristic, stats=None):
+    """
+    Jump point search for problems over the positions of a Pacman maze with
+    unit step costs, such as PositionSearchProblem and AnyFoodSearchProblem
+    with their default cost function.  It searches the problem's wall grid
+    directly (see gridSearch.py) and returns the same optimal plan length as
+    A* while expanding only the cells where paths can turn.
+
+    Problems it cannot handle, such as those with a non-uniform costFn or
+    whose states are not positions, are solved with ordinary aStarSearch.
+
+    In stats, expanded and generated nodes are jump points, and successor
+    time is the time spent jumping.
+    """
+    import gridSearch
+    if not gridSearch.hasUniformCost(problem):
+        return aStarSearch(problem, heuristic, stats)
+    if stats is not None:
+        stats.start()
+        heuristic = stats.timeHeuristic(heuristic)
+    actions, expanded = gridSearch.jumpPointSearch(problem.walls, problem.getStartState(),
+                                                   problem.isGoalState,
+                                                   lambda cell: heuristic(cell, problem), stats)
+    if '_expanded' in dir(problem):
+        problem._expanded += expanded
+    return _finish(stats, actions)
+
+def anytimeAStarSearch(problem: SearchProblem, heuristic=nullHeuristic, timeLimit=None,
+                       weights=(5, 3, 2, 1.5, 1), info=None, stats=None):
+    """
+    Anytime repairing A* (ARA*).  A first plan is found quickly with weighted
+    A*, which orders the frontier by g + w * h for a large weight w, and is
+    then improved by searching again with each smaller weight in turn.  Each
+    search reuses the work of the previous ones: only states whose cost has
+    dropped since they were expanded are expanded again.
+
+    With an admissible heuristic, the plan found with weight w costs at most
+    w times the optimal cost, and the last weight of 1 gives an optimal plan.
+
+      timeLimit: seconds after which no more improvement is attempted; the
+                 best plan found so far is returned.  The first search runs
+                 past the limit until it finds a plan, so a plan is returned
+                 whenever the goal is reachable.  With no limit every weight
+                 is run.
+      info:      an optional dictionary which receives 'bound', a factor by
+                 which the returned plan is guaranteed to be within the
+                 optimal cost (inf if no search finished in time), and
+                 'weight', the last weight that was run to completion.
+    """
+    return runSearch(anytimeAStarSearchSteps(problem, heuristic, timeLimit, weights, info, stats))
+
+def anytimeAStarSearchSteps(problem: SearchProblem, heuristic=nullHeuristic, timeLimit=None,
+                            weights=(5, 3, 2, 1.5, 1), info=None, stats=None):
+    """
+    Generator form of anytimeAStarSearch: yields a SearchStep after every
+    expansion and returns the plan (see runSearch).  bestNode in each step is
+    the goal node of the best plan found so far, and bestCost its cost; a
+    caller that closes the generator early can take that plan from the last
+    step.
+    """
+    getSuccessors = problem.getSuccessors
+    if stats is not None:
+        stats.start()
+        getSuccessors = stats.timeSuccessors(getSuccessors)
+        heuristic = stats.timeHeuristic(heuristic)
+    try:
+        deadline = None if timeLimit is None else time.time() + timeLimit
+        h_values = {}  # heuristic cache, as every state is re-prioritised for each weight
+
+        def h(state):
+            if state not in h_values:
+                h_values[state] = heuristic(state, problem)
+            return h_values[state]
+
+        start_node = SearchNode(problem.getStartState())
+        best = {start_node.state: start_node}  # cheapest node found for each state
+        goal_node = start_node if problem.isGoalState(start_node.state) else None
+        inconsistent = {start_node.state}  # states to (re)expand in the next search
+        bound, last_weight = float('inf'), None
+        for weight in weights:
+            frontier = util.IndexedPriorityQueue(key=lambda node: node.state)
+            for state in inconsistent:
+                frontier.push(best[state], best[state].pathCost + weight * h(state))
+            inconsistent = set()
+            closed = set()
+            timed_out = False
+            while not frontier.isEmpty():
+                if goal_node is not None and goal_node.pathCost <= frontier.peekPriority():
+                    break  # the plan is within weight of optimal
+                if deadline is not None and goal_node is not None and time.time() >= deadline:
+                    timed_out = True
+                    break
+                curr_f = frontier.peekPriority()
+                curr_node = frontier.pop()
+                closed.add(curr_node.state)
+                for child_state, action, step_cost in getSuccessors(curr_node.state):
+                    if child_state in best and best[child_state].pathCost <= curr_node.pathCost + step_cost:
+                        if stats is not None:
+                            stats.duplicatesPruned += 1
+                        continue
+                    child_node = SearchNode(child_state, curr_node, action, step_cost)
+                    best[child_state] = child_node
+                    if problem.isGoalState(child_state) and \
+                            (goal_node is None or child_node.pathCost < goal_node.pathCost):
+                        goal_node = child_node
+                    if child_state in closed:
+                        inconsistent.add(child_state)  # cheaper now, but only re-expanded next time
+                    else:
+                        frontier.push(child_node, child_node.pathCost + weight * h(child_state))
+                if stats is not None:
+                    stats.noteSizes(len(frontier), len(closed))
+                yield SearchStep(curr_node, len(frontier), curr_f,
+                                 goal_node.pathCost if goal_node is not None else float('inf'), goal_node)
+            inconsistent.update(frontier.keys())  # carried over unexpanded
+            if timed_out:
+                break
+            last_weight = weight
+            if goal_node is not None:
+                lower = min([best[s].pathCost + h(s) for s in inconsistent], default=float('inf'))
+                bound = min(weight, goal_node.pathCost / lower) if lower > 0 else weight
+                bound = max(bound, 1)
+            if deadline is not None and time.time() >= deadline:
+                break
+
+        if info is not None:
+            info['bound'] = bound if goal_node is not None else float('inf')
+            info['weight'] = last_weight
+        return goal_node.getPath() if goal_node is not None else None
+    finally:
+        if stats is not None:
+            stats.stop()
+
+def portfolioSearch(problem: SearchProblem, heuristic=nullHeuristic, info=None, stats=None):
+    """
+    Runs several optimal searches on problem at once, each in its own process
+    (see parallelSearch.py), and returns the plan of whichever finishes first;
+    the others are stopped.  The portfolio is uniform cost search plus A* with
+    each heuristic given, so it is worth using when it is not clear in advance
+    which heuristic, if any, pays for its cost on a layout.
+
+      heuristic: a heuristic, or a list of heuristics, each consistent
+      info:      an optional dict; info['winner'] is set to the name of the
+                 configuration that finished first, e.g. 'astar/manhattanHeuristic'
+
+    SearchAgent accepts several heuristics joined by '+', e.g.
+      -a fn=portfolio,heuristic=manhattanHeuristic+euclideanHeuristic
+    """
+    import parallelSearch
+    heuristics = heuristic if type(heuristic) in (list, tuple) else [heuristic]
+    configurations = [('ucs', uniformCostSearch, {})]
+    for h in heuristics:
+        if h is not nullHeuristic:
+            configurations.append(('astar/' + h.__name__, aStarSearch, {'heuristic': h}))
+    winner, plan = parallelSearch.runPortfolio(problem, configurations, stats)
+    if info is not None:
+        info['winner'] = winner
+    return plan
+
+def hdaStarSearch(problem: SearchProblem, heuristic=nullHeuristic, workers=None, stats=None):
+    """
+    Hash distributed A* (HDA*): A* spread over several worker processes,
+    each of which owns the states that hash to it and exchanges generated
+    nodes with the others through queues (see
+    parallelSearch.hashDistributedAStar).  With an admissible heuristic the
+    plan is optimal, like aStarSearch's, though expansion order differs.
+
+      workers: the number of worker processes (default: one per CPU)
+
+    Speedup depends on how expensive each expansion is relative to sending
+    a node between processes, and needs one CPU per worker.  The speedup
+    with more workers has not been measured: the only timings so far come
+    from a machine with a single CPU, where extra workers can only add
+    overhead (trickySearch, FoodSearchProblem with nullHeuristic, took
+    4.0-5.5s with 1 worker, 6.4-6.7s with 2 and 7.2-10.1s with 4).  Time
+    hdaStarSearch for 1, 2, 4 and 8 workers on a multi-core machine before
+    relying on a speedup.
+
+    Without fork (e.g. on Windows) it runs aStarSearch instead.
+    """
+    import parallelSearch
+    if not parallelSearch.canFork():
+        return aStarSearch(problem, heuristic, stats)
+    if stats is not None:
+        stats.start()
+    plan = parallelSearch.hashDistributedAStar(problem, heuristic, workers, stats=stats)
+    return _finish(stats, plan)
 
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+idastar = idaStarSearch
+bds = bidirectionalSearch
+jps = jumpPointSearch
+araStar = anytimeAStarSearch
+portfolio = portfolioSearch
+hdastar = hdaStarSearch
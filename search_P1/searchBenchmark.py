@@ -0,0 +1,341 @@
+# searchBenchmark.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Runs every search algorithm in search.py (dfs, bfs, ucs, and astar with each
+heuristic written for the problem, plus the other searches that suit the
+problem) on every benchmark problem, and compares the results with a stored
+baseline so that a change to search.py or searchAgents.py which makes a
+search slower or worse shows up at once.
+
+Problems:
+
+  position:      PositionSearchProblem on tinyMaze, smallMaze, mediumMaze, bigMaze
+  corners:       CornersProblem on tinyCorners, mediumCorners, bigCorners
+  packedCorners: PackedCornersProblem on the corners layouts
+  food:          FoodSearchProblem on testSearch, tinySearch, trickySearch
+  bitmaskFood:   BitmaskFoodSearchProblem on the food layouts
+  eightpuzzle:   EightPuzzleSearchProblem on the puzzles of EIGHT_PUZZLE_DATA
+
+Searches which do not take a SearchStats, such as eightPuzzleTableSearch,
+are reported as expanding no nodes.
+
+For each case the best wall time of a few runs, the number of nodes expanded,
+the peak memory allocated during the search (measured by tracemalloc, in a
+separate untimed run) and the cost of the plan are recorded.  A case
+regresses when its plan costs more or it expands more nodes than in the
+baseline, or when its time or memory grows by more than the tolerance.
+Every search except dfs should find an optimal plan, so a case also fails
+when its plan costs more or less than ucs's on the same instance (of the
+problem in REFERENCE_KINDS, for another encoding of a problem).  The
+command exits with status 1 if any case regressed.  hdastar expands nodes in
+worker processes, so its expansions and its time depend on how they are
+scheduled; only its plan is compared, and its peak memory is only that of
+the process coordinating them.
+
+Timings depend on the machine, so save a baseline of your own before making
+changes:
+
+> python searchBenchmark.py --save-baseline
+> python searchBenchmark.py
+> python searchBenchmark.py -c bigMaze,eightpuzzle -o results.json
+"""
+
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import eightpuzzle
+import search
+import searchAgents
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'searchBenchmarkBaseline.json')
+FORMAT_VERSION = 1
+
+ALGORITHMS = ['dfs', 'bfs', 'ucs']  # plus astar with each of the problem's heuristics
+SUBOPTIMAL = ['dfs']  # the only searches whose plans need not cost what ucs's do
+NONDETERMINISTIC = ['hdastar']  # searches whose expansions and time vary from run to run
+SEARCH_OPTIONS = {'hdastar': {'workers': 2}}  # so that workers exchange nodes even on one CPU
+
+PROBLEMS = [
+    # (kind, instances, heuristics, searches); searches which take a heuristic get the first one
+    ('position', ['tinyMaze', 'smallMaze', 'mediumMaze', 'bigMaze'], ['manhattanHeuristic', 'euclideanHeuristic'],
+     ['idastar', 'bds', 'jps', 'araStar', 'hdastar']),
+    ('corners', ['tinyCorners', 'mediumCorners', 'bigCorners'], ['cornersHeuristic'], ['araStar', 'hdastar']),
+    ('packedCorners', ['tinyCorners', 'mediumCorners', 'bigCorners'], ['cornersHeuristic'], []),
+    ('food', ['testSearch', 'tinySearch', 'trickySearch'], ['foodHeuristic'], ['araStar']),
+    ('bitmaskFood', ['testSearch', 'tinySearch', 'trickySearch'], ['foodHeuristic'], []),
+    ('eightpuzzle', [str(i) for i in range(len(eightpuzzle.EIGHT_PUZZLE_DATA))], ['eightPuzzleHeuristic'],
+     ['idastar', 'araStar', 'hdastar', 'eightPuzzleTableSearch']),
+]
+
+# Kinds which encode the states of another kind differently, so must find plans of the same cost
+REFERENCE_KINDS = {'packedCorners': 'corners', 'bitmaskFood': 'food'}
+
+# Changes in time or memory smaller than these are noise, whatever the ratio
+MIN_TIME_CHANGE = 0.005
+MIN_MEMORY_CHANGE = 64 * 1024
+
+def loadGameState(layoutName):
+    import layout, pacman
+    lay = layout.getLayout(layoutName)
+    if lay is None:
+        raise Exception("The layout " + layoutName + " cannot be found")
+    gameState = pacman.GameState()
+    gameState.initialize(lay, 0)
+    return gameState
+
+def getProblemFactory(kind, instance):
+    "Returns a function that makes a fresh search problem of the given kind."
+    if kind == 'eightpuzzle':
+        puzzle = eightpuzzle.loadEightPuzzle(int(instance))
+        return lambda: eightpuzzle.EightPuzzleSearchProblem(puzzle)
+    gameState = loadGameState(instance)
+    if kind == 'position':
+        return lambda: searchAgents.PositionSearchProblem(gameState, warn=False, visualize=False)
+    if kind == 'corners':
+        return lambda: searchAgents.CornersProblem(gameState)
+    if kind == 'packedCorners':
+        return lambda: searchAgents.PackedCornersProblem(gameState)
+    if kind == 'food':
+        return lambda: searchAgents.FoodSearchProblem(gameState)
+    if kind == 'bitmaskFood':
+        return lambda: searchAgents.BitmaskFoodSearchProblem(gameState)
+    raise Exception('Unknown problem kind: ' + kind)
+
+def getCases(patterns=None):
+    """
+    Returns the benchmark matrix as a list of (name, makeProblem, algorithm,
+    heuristic, options) cases, where heuristic is None for uninformed
+    searches and options are extra keyword arguments for the search.  With
+    patterns, only the cases whose name contains one of them are returned.
+    """
+    cases = []
+    for kind, instances, heuristics, searches in PROBLEMS:
+        module = eightpuzzle if kind == 'eightpuzzle' else searchAgents
+        for instance in instances:
+            names = [(algorithm, algorithm, None) for algorithm in ALGORITHMS]
+            names += [('astar-' + heuristic, 'astar', heuristic) for heuristic in heuristics]
+            for algorithm in searches:
+                if takesArgument(getSearchFunction(module, algorithm), 'heuristic'):
+                    names.append((algorithm + '-' + heuristics[0], algorithm, heuristics[0]))
+                else:
+                    names.append((algorithm, algorithm, None))
+            selected = [(name, algorithm, heuristic) for name, algorithm, heuristic in names
+                        if patterns is None or any(p in '/'.join([kind, instance, name]) for p in patterns)]
+            if not selected:
+                continue
+            makeProblem = getProblemFactory(kind, instance)
+            for name, algorithm, heuristic in selected:
+                if heuristic is not None:
+                    heuristic = getattr(module, heuristic)
+                cases.append(('/'.join([kind, instance, name]), makeProblem, getSearchFunction(module, algorithm),
+                              heuristic, SEARCH_OPTIONS.get(algorithm, {})))
+    return cases
+
+def getSearchFunction(module, algorithm):
+    "Returns the search called algorithm in search.py, or else in the problem's module."
+    if hasattr(search, algorithm):
+        return getattr(search, algorithm)
+    return getattr(module, algorithm)
+
+def takesArgument(function, name):
+    return name in function.__code__.co_varnames[:function.__code__.co_argcount]
+
+def getAlgorithm(name):
+    "Returns the search of a case name, e.g. 'idastar' for 'position/bigMaze/idastar-manhattanHeuristic'."
+    return name.split('/')[2].split('-')[0]
+
+def runSearch(function, problem, heuristic, stats=None, options={}):
+    if takesArgument(function, 'stats'):
+        options = dict(options, stats=stats)
+    if heuristic is None:
+        return function(problem, **options)
+    return function(problem, heuristic, **options)
+
+def runCase(makeProblem, function, heuristic, repeats, options={}):
+    """
+    Runs one case and returns its measurements: wallTime (seconds, the best
+    of repeats runs), expanded, peakMemory (bytes) and cost (None if no plan
+    was found).
+    """
+    if heuristic is not None:
+        problem = makeProblem()
+        heuristic(problem.getStartState(), problem)  # builds any tables the heuristic loads on first use
+    best = None
+    for _ in range(repeats):
+        problem = makeProblem()
+        gc.collect()  # so that no run pays for collecting the garbage of the one before
+        start = time.perf_counter()
+        runSearch(function, problem, heuristic, options=options)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    problem = makeProblem()
+    stats = search.SearchStats()
+    tracemalloc.start()
+    try:
+        plan = runSearch(function, problem, heuristic, stats, options)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'wallTime': best,
+            'expanded': stats.nodesExpanded,
+            'peakMemory': peak,
+            'cost': None if plan is None else problem.getCostOfActions(plan)}
+
+def runBenchmarks(cases, repeats):
+    "Runs every case and returns a dict mapping case names to their measurements."
+    results = {}
+    for name, makeProblem, function, heuristic, options in cases:
+        results[name] = runCase(makeProblem, function, heuristic, repeats, options)
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    Returns the regressions of results against baseline (both dicts mapping
+    case names to measurements) as a list of (case, field, old, new).
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        old = baseline[name]
+        if old['cost'] is not None and (result['cost'] is None or result['cost'] > old['cost']):
+            regressions.append((name, 'cost', old['cost'], result['cost']))
+        if getAlgorithm(name) in NONDETERMINISTIC:
+            continue
+        if result['expanded'] > old['expanded']:
+            regressions.append((name, 'expanded', old['expanded'], result['expanded']))
+        for field, minChange in (('wallTime', MIN_TIME_CHANGE), ('peakMemory', MIN_MEMORY_CHANGE)):
+            if result[field] > old[field] * (1 + tolerance) and result[field] - old[field] > minChange:
+                regressions.append((name, field, old[field], result[field]))
+    return regressions
+
+def checkOptimality(results, baseline=None):
+    """
+    Returns the cases of results, other than those of SUBOPTIMAL searches,
+    whose plans cost something other than ucs's plan for the same instance,
+    of the reference kind if there is one, as a list of (case, 'optimal', ucs
+    cost, cost).  ucs's cost is taken from results, or from baseline if ucs
+    was not run on the instance.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        if getAlgorithm(name) in SUBOPTIMAL:
+            continue
+        kind, instance = name.split('/')[:2]
+        reference = '/'.join([REFERENCE_KINDS.get(kind, kind), instance, 'ucs'])
+        if reference in results:
+            optimal = results[reference]['cost']
+        elif baseline is not None and reference in baseline:
+            optimal = baseline[reference]['cost']
+        else:
+            continue
+        if result['cost'] != optimal:
+            regressions.append((name, 'optimal', optimal, result['cost']))
+    return regressions
+
+def loadResults(path):
+    "Reads the cases of a results file written by saveResults, or returns None if there is none."
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('format') != FORMAT_VERSION:
+        return None
+    return data['cases']
+
+def saveResults(path, results, repeats):
+    data = {'format': FORMAT_VERSION,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'repeats': repeats,
+            'cases': results}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+def printResults(results, baseline=None):
+    print('%-52s %10s %9s %10s %7s %8s' % ('case', 'ms', 'expanded', 'peak KB', 'cost', 'vs base'))
+    for name, result in sorted(results.items()):
+        ratio = ''
+        if baseline is not None and name in baseline and baseline[name]['wallTime'] > 0:
+            ratio = '%.2fx' % (result['wallTime'] / baseline[name]['wallTime'])
+        print('%-52s %10.2f %9d %10.1f %7s %8s' % (name, result['wallTime'] * 1000, result['expanded'],
+                                                   result['peakMemory'] / 1024.0, result['cost'], ratio))
+
+def printRegressions(regressions):
+    if not regressions:
+        print('No regressions')
+        return
+    print('%d regressions:' % len(regressions))
+    for name, field, old, new in regressions:
+        print('  %-52s %-10s %s -> %s' % (name, field, old, new))
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser(usage=__doc__)
+    parser.add_option('-c', '--cases', dest='cases', default='',
+                      help='comma separated parts of the case names to run, e.g. bigMaze,astar (default all)')
+    parser.add_option('-r', '--repeats', dest='repeats', type='int', default=3,
+                      help='timed runs per case; the best is reported (default %default)')
+    parser.add_option('-o', '--output', dest='output', default=None,
+                      help='file to write the results to, as JSON')
+    parser.add_option('-b', '--baseline', dest='baseline', default=BASELINE,
+                      help='results file to compare against (default %default)')
+    parser.add_option('-s', '--save-baseline', dest='saveBaseline', action='store_true', default=False,
+                      help='save the results as the new baseline instead of comparing against it')
+    parser.add_option('-t', '--tolerance', dest='tolerance', type='float', default=0.5,
+                      help='fraction by which time and memory may grow before it counts as a regression (default %default)')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+if __name__ == '__main__':
+    options = readCommand(sys.argv[1:])
+    patterns = [pattern for pattern in options.cases.split(',') if pattern] or None
+    results = runBenchmarks(getCases(patterns), options.repeats)
+    if options.output is not None:
+        saveResults(options.output, results, options.repeats)
+    if options.saveBaseline:
+        regressions = checkOptimality(results)
+        if regressions:
+            # A baseline of wrong plans would hide the bug from every later run
+            printResults(results)
+            printRegressions(regressions)
+            sys.exit(1)
+        if patterns is not None:
+            # Keep the baseline of the cases that were not run
+            baseline = loadResults(options.baseline) or {}
+            baseline.update(results)
+            results = baseline
+        saveResults(options.baseline, results, options.repeats)
+        printResults(results)
+        print('Saved the baseline to ' + options.baseline)
+        sys.exit(0)
+    baseline = loadResults(options.baseline)
+    printResults(results, baseline)
+    regressions = checkOptimality(results, baseline)
+    if baseline is None:
+        print('No baseline at %s; save one with --save-baseline' % options.baseline)
+    else:
+        regressions += compare(results, baseline, options.tolerance)
+    printRegressions(regressions)
+    sys.exit(1 if regressions else 0)
@@ -45,6 +45,18 @@ def followPath(path, problem):
     states.append(state)
   return states
 
+def runSearch(search, alg, problem, *args):
+  """
+  Runs the search function alg on problem.  If alg takes a stats argument it
+  is given a search.SearchStats to fill in, so that tests can report node
+  counts and timings.  Returns (solution, stats); stats is None for search
+  functions that do not record any.
+  """
+  if 'stats' in alg.__code__.co_varnames:
+    stats = search.SearchStats()
+    return alg(problem, *args, stats=stats), stats
+  return alg(problem, *args), None
+
 def checkSolution(problem, path):
   state = problem.getStartState()
   for action in path:
@@ -182,9 +194,9 @@ class GraphSearchTest(testClasses.TestCase):
         alg = getattr(search, self.alg)
         problem = GraphSearch(self.graph_text)
         if self.heuristic != None:
-            solution = alg(problem, self.heuristic)
+            solution, self.stats = runSearch(search, alg, problem, self.heuristic)
         else:
-            solution = alg(problem)
+            solution, self.stats = runSearch(search, alg, problem)
 
         if type(solution) != type([]):
             return None, None, 'The result of %s must be a list. (Instead, it is %s)' % (self.alg, type(solution))
@@ -210,6 +222,8 @@ class GraphSearchTest(testClasses.TestCase):
             grades.addMessage('PASS: %s' % self.path)
             grades.addMessage('\tsolution:\t\t%s' % solution)
             grades.addMessage('\texpanded_states:\t%s' % expanded_states)
+            if self.stats != None:
+                grades.addMessage('\tsearch stats:\t\t%s' % self.stats)
             return True
         else:
             grades.addMessage('FAIL: %s' % self.path)
@@ -283,9 +297,9 @@ class PacmanSearchTest(testClasses.TestCase):
         heuristic = getattr(searchAgents, self.heuristicName) if self.heuristicName != None else None
 
         if heuristic != None:
-            solution = alg(problem, heuristic)
+            solution, self.stats = runSearch(search, alg, problem, heuristic)
         else:
-            solution = alg(problem)
+            solution, self.stats = runSearch(search, alg, problem)
 
         if type(solution) != type([]):
             return None, None, 'The result of %s must be a list. (Instead, it is %s)' % (self.alg, type(solution))
@@ -336,6 +350,8 @@ class PacmanSearchTest(testClasses.TestCase):
         grades.addMessage('\tpacman layout:\t\t%s' % self.layoutName)
         grades.addMessage('\tsolution length: %s' % len(solution))
         grades.addMessage('\tnodes expanded:\t\t%s' % expanded)
+        if self.stats != None:
+            grades.addMessage('\tsearch stats:\t\t%s' % self.stats)
         return True
 
 
@@ -576,7 +592,7 @@ class HeuristicGrade(testClasses.TestCase):
         searchAgents = moduleDict['searchAgents']
         problem, _, heuristic = self.setupProblem(searchAgents)
 
-        path = search.astar(problem, heuristic)
+        path, stats = runSearch(search, search.astar, problem, heuristic)
 
         expanded = problem._expanded
 
@@ -598,6 +614,8 @@ class HeuristicGrade(testClasses.TestCase):
             grades.addMessage('FAIL: %s' % self.path)
         grades.addMessage('\texpanded nodes: %s' % expanded)
         grades.addMessage('\tthresholds: %s' % self.thresholds)
+        if stats != None:
+            grades.addMessage('\tsearch stats: %s' % stats)
 
         return True
 
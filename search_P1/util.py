@@ -29,6 +29,10 @@
 import sys
 import inspect
 import heapq, random
+import collections
+import os
+import stat
+import tempfile
 
 
 class FixedRandom:
@@ -147,26 +151,35 @@ class Stack:
         "Returns true if the stack is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class Queue:
-    "A container with a first-in-first-out (FIFO) queuing policy."
+    """
+    A container with a first-in-first-out (FIFO) queuing policy.  Backed by a
+    collections.deque, so both push and pop take constant time.
+    """
     def __init__(self):
-        self.list = []
+        self.list = collections.deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0,item)
+        self.list.append(item)
 
     def pop(self):
         """
           Dequeue the earliest enqueued item still in the queue. This
           operation removes the item from the queue.
         """
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         "Returns true if the queue is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class PriorityQueue:
     """
       Implements a priority queue data structure. Each inserted item
@@ -190,6 +203,9 @@ class PriorityQueue:
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def __len__(self):
+        return len(self.heap)
+
     def update(self, item, priority):
         # If item already in priority queue with higher priority, update its priority and rebuild the heap.
         # If item already in priority queue with equal or lower priority, do nothing.
@@ -221,11 +237,374 @@ class PriorityQueueWithFunction(PriorityQueue):
         "Adds an item to the queue with priority from the priority function"
         PriorityQueue.push(self, item, self.priorityFunction(item))
 
+class IndexedPriorityQueue:
+    """
+      A priority queue holding at most one entry per key, backed by a binary
+      heap together with a map from each key to its position in the heap.
+      Membership tests are O(1) and push, pop and update (decrease-key) are
+      O(log n), where PriorityQueue.update has to scan and re-heapify the
+      whole heap.
+
+      The key of an item is given by the key function (by default the item
+      itself); search code keys nodes by their state so the frontier keeps a
+      single entry per state instead of piling up stale duplicates.
+
+      Entries with equal priority leave the queue in the order they were last
+      pushed or improved, which is the order a plain PriorityQueue holding the
+      duplicates would have returned them in.
+
+      >>> q = IndexedPriorityQueue()
+      >>> q.push('a', 3)
+      >>> q.push('b', 2)
+      >>> q.update('a', 1)
+      True
+      >>> q.update('b', 5)
+      False
+      >>> 'b' in q
+      True
+      >>> [q.pop(), q.pop()]
+      ['a', 'b']
+    """
+    def  __init__(self, key=None):
+        self.heap = []      # entries are [priority, count, key, item]; counts are unique,
+                            # so entries compare on (priority, count) alone
+        self.index = {}     # key -> position of its entry in self.heap
+        self.count = 0
+        self.key = key if key is not None else (lambda item: item)
+
+    def push(self, item, priority):
+        """
+        Adds an item to the queue.  If an item with the same key is already
+        queued, it is replaced regardless of its priority.
+        """
+        key = self.key(item)
+        entry = [priority, self.count, key, item]
+        self.count += 1
+        if key in self.index:
+            position = self.index[key]
+            old = self.heap[position]
+            self.heap[position] = entry
+            if entry < old:
+                self._siftUp(position)
+            else:
+                self._siftDown(position)
+        else:
+            self.heap.append(entry)
+            self.index[key] = len(self.heap) - 1
+            self._siftUp(len(self.heap) - 1)
+
+    def pop(self):
+        last = self.heap.pop()
+        if self.heap:
+            entry = self.heap[0]
+            self.heap[0] = last
+            self.index[last[2]] = 0
+            self._siftDown(0)
+        else:
+            entry = last
+        del self.index[entry[2]]
+        return entry[3]
+
+    def isEmpty(self):
+        return len(self.heap) == 0
+
+    def update(self, item, priority):
+        # If an item with this key is queued with higher priority, replace it and restore the heap order.
+        # If an item with this key is queued with equal or lower priority, do nothing.
+        # If no item with this key is queued, do the same thing as self.push.
+        # Returns whether the queue was changed.
+        key = self.key(item)
+        if key in self.index and self.heap[self.index[key]][0] <= priority:
+            return False
+        self.push(item, priority)
+        return True
+
+    def getPriority(self, key):
+        "Returns the priority of the entry queued under key"
+        return self.heap[self.index[key]][0]
+
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        return self.heap[0][0]
+
+    def keys(self):
+        "Returns the keys of all queued items, in no particular order"
+        return list(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __len__(self):
+        return len(self.heap)
+
+    def _siftUp(self, position):
+        heap, index = self.heap, self.index
+        entry = heap[position]
+        while position > 0:
+            parentPosition = (position - 1) >> 1
+            parent = heap[parentPosition]
+            if not entry < parent:
+                break
+            heap[position] = parent
+            index[parent[2]] = position
+            position = parentPosition
+        heap[position] = entry
+        index[entry[2]] = position
+
+    def _siftDown(self, position):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            childPosition = 2 * position + 1
+            if childPosition >= size:
+                break
+            right = childPosition + 1
+            if right < size and heap[right] < heap[childPosition]:
+                childPosition = right
+            child = heap[childPosition]
+            if not child < entry:
+                break
+            heap[position] = child
+            index[child[2]] = position
+            position = childPosition
+        heap[position] = entry
+        index[entry[2]] = position
+
+class BucketPriorityQueue:
+    """
+      An IndexedPriorityQueue for integer priorities, kept as a bucket queue
+      (Dial's algorithm): one FIFO bucket per distinct priority, plus a heap
+      of the priorities that have a bucket.  Pushing and popping cost O(1)
+      plus O(log d), d being the number of distinct priorities queued, which
+      in A* over unit-cost problems is rarely more than two or three.
+
+      An improved entry is marked dead where it lies and a new one appended
+      to its new bucket, so entries with equal priority leave in the order
+      they were last pushed or improved, exactly as from an
+      IndexedPriorityQueue.
+
+      The first priority that is not an integer (a float such as 2.5, or
+      infinity) moves every entry, in order, into an IndexedPriorityQueue,
+      which serves all later calls; the order of the queue is unchanged.
+
+      >>> q = BucketPriorityQueue()
+      >>> q.push('a', 3)
+      >>> q.push('b', 2)
+      >>> q.update('a', 1)
+      True
+      >>> q.update('b', 5)
+      False
+      >>> q.push('c', 1.5)
+      >>> [q.pop(), q.pop(), q.pop()]
+      ['a', 'c', 'b']
+    """
+    def  __init__(self, key=None):
+        self.buckets = {}       # priority -> deque of entries [priority, key, item, live]
+        self.priorities = []    # heap of the priorities in self.buckets
+        self.index = {}         # key -> its live entry
+        self.key = key if key is not None else (lambda item: item)
+        self.heap = None        # the IndexedPriorityQueue taking over after a non-integer priority
+
+    def isIntegral(priority):
+        return type(priority) == int or (type(priority) == float and priority.is_integer())
+    isIntegral = staticmethod(isIntegral)
+
+    def push(self, item, priority):
+        """
+        Adds an item to the queue.  If an item with the same key is already
+        queued, it is replaced regardless of its priority.
+        """
+        if self.heap is None and not self.isIntegral(priority):
+            self._spill()
+        if self.heap is not None:
+            return self.heap.push(item, priority)
+        key = self.key(item)
+        if key in self.index:
+            self.index[key][3] = False
+        entry = [priority, key, item, True]
+        self.index[key] = entry
+        if priority not in self.buckets:
+            self.buckets[priority] = collections.deque()
+            heapq.heappush(self.priorities, priority)
+        self.buckets[priority].append(entry)
+
+    def pop(self):
+        if self.heap is not None:
+            return self.heap.pop()
+        entry = self._first()
+        self.buckets[entry[0]].popleft()
+        del self.index[entry[1]]
+        return entry[2]
+
+    def isEmpty(self):
+        return len(self) == 0
+
+    def update(self, item, priority):
+        # If an item with this key is queued with higher priority, replace it.
+        # If an item with this key is queued with equal or lower priority, do nothing.
+        # If no item with this key is queued, do the same thing as self.push.
+        # Returns whether the queue was changed.
+        if self.heap is not None:
+            return self.heap.update(item, priority)
+        key = self.key(item)
+        if key in self.index and self.index[key][0] <= priority:
+            return False
+        self.push(item, priority)
+        return True
+
+    def getPriority(self, key):
+        "Returns the priority of the entry queued under key"
+        if self.heap is not None:
+            return self.heap.getPriority(key)
+        return self.index[key][0]
+
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        if self.heap is not None:
+            return self.heap.peekPriority()
+        return self._first()[0]
+
+    def keys(self):
+        "Returns the keys of all queued items, in no particular order"
+        if self.heap is not None:
+            return self.heap.keys()
+        return list(self.index)
+
+    def __contains__(self, key):
+        if self.heap is not None:
+            return key in self.heap
+        return key in self.index
+
+    def __len__(self):
+        if self.heap is not None:
+            return len(self.heap)
+        return len(self.index)
+
+    def _first(self):
+        "Returns the first live entry, dropping dead entries and empty buckets in front of it."
+        while True:
+            bucket = self.buckets[self.priorities[0]]
+            while bucket and not bucket[0][3]:
+                bucket.popleft()
+            if bucket:
+                return bucket[0]
+            del self.buckets[heapq.heappop(self.priorities)]
+
+    def _spill(self):
+        "Moves every live entry, in queue order, into an IndexedPriorityQueue."
+        self.heap = IndexedPriorityQueue(self.key)
+        for priority in sorted(self.priorities):
+            for entry in self.buckets[priority]:
+                if entry[3]:
+                    self.heap.push(entry[2], priority)
+        self.buckets, self.priorities, self.index = {}, [], {}
+
 
 def manhattanDistance( xy1, xy2 ):
     "Returns the Manhattan distance between points xy1 and xy2"
     return abs( xy1[0] - xy2[0] ) + abs( xy1[1] - xy2[1] )
 
+def mazeDistances(walls, source, costFn=None):
+    """
+    Returns a dict mapping every cell reachable from source in the maze
+    walls (a game.Grid, indexed as walls[x][y]) to its maze distance from
+    source, found in a single sweep of the maze.
+
+    Distances count steps, found by breadth first search, unless costFn is
+    given, in which case entering cell (x,y) costs costFn((x,y)) and the
+    distances are found by Dijkstra's algorithm.  Because maze distance is
+    symmetric for step counts, mazeDistances(walls, food)[position] is the
+    distance from position to food.
+    """
+    distances = {source: 0}
+    if costFn is None:
+        fringe = collections.deque([source])
+        while fringe:
+            x, y = cell = fringe.popleft()
+            nextDistance = distances[cell] + 1
+            for neighbor in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+                if neighbor not in distances and not walls[neighbor[0]][neighbor[1]]:
+                    distances[neighbor] = nextDistance
+                    fringe.append(neighbor)
+        return distances
+    fringe = [(0, source)]
+    done = set()
+    while fringe:
+        distance, cell = heapq.heappop(fringe)
+        if cell in done:
+            continue
+        done.add(cell)
+        x, y = cell
+        for neighbor in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if neighbor in done or walls[neighbor[0]][neighbor[1]]:
+                continue
+            nextDistance = distance + costFn(neighbor)
+            if neighbor not in distances or nextDistance < distances[neighbor]:
+                distances[neighbor] = nextDistance
+                heapq.heappush(fringe, (nextDistance, neighbor))
+    return distances
+
+def getCacheDirectory(name):
+    """
+    Returns the directory of the named on-disk cache, where tables that are
+    slow to build are kept between runs: $XDG_CACHE_HOME/pacman/name, which
+    is ~/.cache/pacman/name by default.  Unlike the shared temporary
+    directory, it belongs to the user.
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pacman', name)
+
+def isPrivateDirectory(path):
+    """
+    Returns whether path is a directory owned by the user that no one else
+    can write to, so that the cache files in it can be trusted.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(info.st_mode):
+        return False
+    if hasattr(os, 'getuid'):
+        return info.st_uid == os.getuid() and not info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    return True
+
+def writeCacheFile(path, data):
+    """
+    Writes data (bytes) to the cache file at path, creating its directory,
+    accessible only to the user, if need be.  Nothing is written into a
+    directory that is not private (see isPrivateDirectory).  The data goes to
+    a new temporary file made by tempfile.mkstemp, which is then renamed to
+    path, so a concurrent reader never sees a partly written file.
+
+    Returns whether the file was written; failing to save a cache only costs
+    a rebuild next time.
+    """
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    except OSError:
+        return False
+    if not isPrivateDirectory(directory):
+        return False
+    try:
+        handle, temporary = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    except OSError:
+        return False
+    try:
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        return False
+    return True
+
+
 """
   Data structures and functions useful for various course projects
 